@@ -1,52 +1,52 @@
+import math
 import streamlit as st
-import pandas as pd
-import os
-import glob
 import altair as alt
+from dashboards.silver_reader import (dataset_rows, list_dataset_names, numeric_columns, open_silver, read_page,
+                                      resolve_dataset, sample_rows)
 
 st.set_page_config(page_title="India Culture & Tourism Insights (Local Silver Parquet)", layout="wide")
 st.title("India Culture & Tourism Insights Dashboard (Local Silver Parquet Files)")
 
 DATA_FOLDER = "data/silver"
 
-@st.cache_data(ttl=600)
 def list_dataset_folders(path):
-    # List all folders inside silver folder
-    folders = [f for f in os.listdir(path) if os.path.isdir(os.path.join(path, f))]
-    return sorted(folders)
+    # Logical dataset names, straight from the silver catalog
+    return list_dataset_names(path)
 
-@st.cache_data(ttl=600)
-def load_parquet_from_folder(folder_path):
-    # Find the single parquet file inside the folder
-    files = glob.glob(os.path.join(folder_path, "*.parquet"))
-    if not files:
-        return None
-    return pd.read_parquet(files[0])
+# Pages read only the row groups and columns they show; charts use a bounded sample
+PAGE_SIZE = 100
+CHART_SAMPLE_ROWS = 5_000
 
 # List dataset folders
 dataset_folders = list_dataset_folders(DATA_FOLDER)
 selected_dataset = st.selectbox("Select dataset to load", dataset_folders)
 
 if selected_dataset:
-    folder_path = os.path.join(DATA_FOLDER, selected_dataset)
-    df = load_parquet_from_folder(folder_path)
+    folder_path = resolve_dataset(selected_dataset, DATA_FOLDER)
+    try:
+        schema = open_silver(folder_path).schema
+    except FileNotFoundError:
+        schema = None
     
-    if df is not None:
+    if schema is not None:
+        total_rows = dataset_rows(folder_path)
         st.subheader(f"Preview of `{selected_dataset}`")
-        st.dataframe(df.head(100))
+        st.dataframe(read_page(folder_path, 0, PAGE_SIZE))
         
-        st.markdown(f"**Rows:** {df.shape[0]}  |  **Columns:** {df.shape[1]}")
+        st.markdown(f"**Rows:** {total_rows}  |  **Columns:** {len(schema.names)}")
 
-        columns = df.columns.tolist()
+        columns = schema.names
         selected_columns = st.multiselect("Select columns to display", options=columns, default=columns)
 
         if selected_columns:
-            st.dataframe(df[selected_columns].head(100))
+            pages = max(1, math.ceil(total_rows / PAGE_SIZE))
+            page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+            st.dataframe(read_page(folder_path, (page - 1) * PAGE_SIZE, PAGE_SIZE, selected_columns))
         
-        numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
+        numeric_cols = numeric_columns(schema)
         year_col = None
         for col in ["YEAR", "year"]:
-            if col in df.columns:
+            if col in columns:
                 year_col = col
                 break
         
@@ -54,7 +54,9 @@ if selected_dataset:
             numeric_cols_for_plot = [col for col in numeric_cols if col != year_col]
             y_col = st.selectbox("Select numeric column to plot over years", numeric_cols_for_plot)
             if y_col:
-                chart_df = df[[year_col, y_col]].dropna()
+                chart_df = sample_rows(folder_path, CHART_SAMPLE_ROWS, [year_col, y_col]).dropna()
+                if total_rows > CHART_SAMPLE_ROWS:
+                    st.caption(f"Chart shows a random sample of {CHART_SAMPLE_ROWS:,} of {total_rows:,} rows")
                 chart = alt.Chart(chart_df).mark_line(point=True).encode(
                     x=alt.X(f"{year_col}:O", title=year_col),
                     y=alt.Y(f"{y_col}:Q", title=y_col),
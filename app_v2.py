@@ -1,38 +1,62 @@
-import streamlit as st
+import math
+import duckdb
 import pandas as pd
-import os
-import glob
+import streamlit as st
 import altair as alt
+from dashboards.sql_engine import DEFAULT_LIMIT, DEFAULT_TIMEOUT, QueryTimeout, list_tables, run_query
+from dashboards.silver_reader import (category_columns, dataset_rows, list_dataset_names, numeric_columns, open_silver,
+                                      read_page, read_profile, read_silver, resolve_dataset, sample_rows)
 
 st.set_page_config(page_title="India Culture & Tourism Insights", layout="wide")
 st.title("🇮🇳 India Culture & Tourism Dashboard")
 
 DATA_FOLDER = "data/silver"
 
-@st.cache_data(ttl=600)
+def describe_from_profile(profile):
+    # Same rows and columns as df.describe(include="all").T, from the clean stage's profile
+    rows = {}
+    for column in profile["columns"]:
+        quantiles = column.get("quantiles", {})
+        top, freq = column["top"][0] if column["top"] and column["kind"] != "numeric" else (None, None)
+        rows[column["name"]] = {
+            "count": column["count"],
+            "unique": column["distinct"] if column["kind"] != "numeric" else None,
+            "top": top, "freq": freq,
+            "mean": column.get("mean"), "std": column.get("std"),
+            "min": column["min"] if column["kind"] == "numeric" else None,
+            "25%": quantiles.get("0.25"), "50%": quantiles.get("0.5"), "75%": quantiles.get("0.75"),
+            "max": column["max"] if column["kind"] == "numeric" else None,
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
 def list_dataset_folders(path):
-    return sorted([f for f in os.listdir(path) if os.path.isdir(os.path.join(path, f))])
+    # Logical dataset names, straight from the silver catalog
+    return list_dataset_names(path)
 
-@st.cache_data(ttl=600)
-def load_parquet_from_folder(folder_path):
-    files = glob.glob(os.path.join(folder_path, "*.parquet"))
-    if not files:
-        return None
-    return pd.read_parquet(files[0])
+# Pages read only the row groups and columns they show; charts use a bounded sample
+PAGE_SIZE = 100
+CHART_SAMPLE_ROWS = 5_000
 
 # Dataset selection
 dataset_folders = list_dataset_folders(DATA_FOLDER)
 selected_dataset = st.selectbox("📁 Select a Dataset", dataset_folders)
 
 if selected_dataset:
-    folder_path = os.path.join(DATA_FOLDER, selected_dataset)
-    df = load_parquet_from_folder(folder_path)
-
-    if df is not None:
-        # Detect types
-        numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-        year_col = next((col for col in df.columns if col.lower() == "year"), None)
-        category_cols = df.select_dtypes(include=["object"]).columns.tolist()
+    folder_path = resolve_dataset(selected_dataset, DATA_FOLDER)
+    try:
+        schema = open_silver(folder_path).schema
+    except FileNotFoundError:
+        schema = None
+
+    if schema is not None:
+        # Detect types from the Parquet schema, without reading any rows
+        total_rows = dataset_rows(folder_path)
+        columns = schema.names
+        numeric_cols = numeric_columns(schema)
+        year_col = next((col for col in columns if col.lower() == "year"), None)
+        category_cols = category_columns(schema)
+        # Column statistics precomputed by the clean stage (None for older silver builds)
+        profile = read_profile(folder_path)
 
         st.subheader(f"📊 {selected_dataset}: Interactive Dashboard")
 
@@ -40,7 +64,9 @@ if selected_dataset:
         if year_col and numeric_cols:
             st.markdown("### 📈 Trend Over Time")
             y_col = st.selectbox("Choose a numeric metric", [col for col in numeric_cols if col != year_col], key="metric")
-            trend_df = df[[year_col, y_col]].dropna().sort_values(by=year_col)
+            trend_df = sample_rows(folder_path, CHART_SAMPLE_ROWS, [year_col, y_col]).dropna().sort_values(by=year_col)
+            if total_rows > CHART_SAMPLE_ROWS:
+                st.caption(f"Chart shows a random sample of {CHART_SAMPLE_ROWS:,} of {total_rows:,} rows")
 
             chart = alt.Chart(trend_df).mark_line(point=True).encode(
                 x=alt.X(f"{year_col}:O", title="Year"),
@@ -59,9 +85,18 @@ if selected_dataset:
             st.markdown("### 🧭 Top Categories Over Time")
             cat_col = st.selectbox("Choose a category column", category_cols, key="cat_col")
             num_col = st.selectbox("Choose a numeric value", numeric_cols, key="num_col")
-            grouped = df[[year_col, cat_col, num_col]].dropna()
-            top_categories = grouped.groupby(cat_col)[num_col].sum().nlargest(5).index.tolist()
-            filtered = grouped[grouped[cat_col].isin(top_categories)]
+            totals = (profile or {}).get("grouped_totals", {}).get(cat_col, {}).get(num_col)
+            if totals is not None:
+                # Top categories from the profile; only their rows are read
+                top_categories = [category for category, _ in totals[:5]]
+                filtered = read_silver(folder_path, columns=[year_col, cat_col, num_col],
+                                       filters=[(cat_col, "in", top_categories)]).dropna()
+            else:
+                grouped = read_silver(folder_path, columns=[year_col, cat_col, num_col]).dropna()
+                top_categories = grouped.groupby(cat_col)[num_col].sum().nlargest(5).index.tolist()
+                filtered = grouped[grouped[cat_col].isin(top_categories)]
+            if len(filtered) > CHART_SAMPLE_ROWS:
+                filtered = filtered.sample(CHART_SAMPLE_ROWS, random_state=0).sort_index()
 
             chart = alt.Chart(filtered).mark_line(point=True).encode(
                 x=alt.X(f"{year_col}:O", title="Year"),
@@ -74,23 +109,52 @@ if selected_dataset:
 
         # Section 3: Quick Stats
         st.markdown("### 🧮 Quick Stats")
-        st.markdown(f"**Shape:** `{df.shape[0]:,}` rows × `{df.shape[1]:,}` columns")
+        st.markdown(f"**Shape:** `{total_rows:,}` rows × `{len(columns):,}` columns")
         st.markdown("**Columns:**")
-        st.write(df.columns.tolist())
+        if profile is not None:
+            st.dataframe(pd.DataFrame(profile["columns"])[["name", "type", "null_count", "distinct"]],
+                         use_container_width=True, hide_index=True)
+        else:
+            st.write(columns)
 
         # Section 4: Preview
         with st.expander("🔍 Preview Raw Data (Top 100 Rows)"):
-            st.dataframe(df.head(100), use_container_width=True)
+            st.dataframe(read_page(folder_path, 0, PAGE_SIZE), use_container_width=True)
 
         # Section 5: Column-wise Filtering
         with st.expander("📌 Column Filtering & Selection"):
-            selected_columns = st.multiselect("Select columns to view", options=df.columns.tolist(), default=df.columns.tolist())
+            selected_columns = st.multiselect("Select columns to view", options=columns, default=columns)
             if selected_columns:
-                st.dataframe(df[selected_columns].head(100), use_container_width=True)
+                pages = max(1, math.ceil(total_rows / PAGE_SIZE))
+                page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+                st.dataframe(read_page(folder_path, (page - 1) * PAGE_SIZE, PAGE_SIZE, selected_columns),
+                             use_container_width=True)
 
         # Section 6: Descriptive Stats
         with st.expander("📉 Descriptive Statistics"):
-            st.dataframe(df.describe(include="all").T, use_container_width=True)
+            stats = describe_from_profile(profile) if profile is not None else read_silver(folder_path).describe(include="all").T
+            st.dataframe(stats, use_container_width=True)
+
+        # Section 7: Ad-hoc SQL over every silver dataset (DuckDB, straight from Parquet)
+        with st.expander("🦆 SQL Query"):
+            tables = list_tables(DATA_FOLDER)
+            st.caption("Every dataset is a table named after it; join across datasets on year or state.")
+            st.json({table: [column for column, _ in cols] for table, cols in tables.items()}, expanded=False)
+            sql = st.text_area("SQL", value=f'SELECT * FROM "{selected_dataset}"', height=120)
+            limit_col, timeout_col = st.columns(2)
+            limit = limit_col.number_input("Row limit", min_value=1, max_value=100_000, value=DEFAULT_LIMIT)
+            timeout = timeout_col.number_input("Timeout (s)", min_value=1, max_value=600, value=DEFAULT_TIMEOUT)
+            if st.button("▶️ Run query"):
+                try:
+                    result, truncated = run_query(sql, limit=limit, timeout=timeout, base_folder=DATA_FOLDER)
+                except QueryTimeout as e:
+                    st.error(f"⏱️ {e}")
+                except (ValueError, duckdb.Error) as e:
+                    st.error(f"❌ {e}")
+                else:
+                    st.dataframe(result, use_container_width=True)
+                    if truncated:
+                        st.caption(f"Showing the first {limit:,} rows")
 
     else:
         st.error("❌ No parquet file found in the selected folder.")
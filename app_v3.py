@@ -1,5 +1,21 @@
+import importlib
 import streamlit as st
-from dashboards import dtv_dashboard, fee_dashboard, fta_dashboard, protected_monuments_dashboard, eco_sensitive_dashboard, hotspots_dashboard
+
+# Dashboards are imported on first selection, and each imports its plotting backend
+# (matplotlib/seaborn, plotly, altair) inside the functions that draw, so a new session
+# only pays for the page it shows. `python import_time_report.py` breaks startup down.
+DASHBOARDS = {
+    "📍 Tourist Hotspots": "dashboards.hotspots_dashboard",
+    "🏰 Protected Monuments": "dashboards.protected_monuments_dashboard",
+    "🌿 Eco-sensitive Zones": "dashboards.eco_sensitive_dashboard",
+    "✈️ Foreign Tourist Arrivals": "dashboards.fta_dashboard",
+    "💰 Foreign Exchange Earnings (FEE)": "dashboards.fee_dashboard",
+    "🏞️ Domestic Tourist Visits (DTV)": "dashboards.dtv_dashboard",
+}
+
+def load_dashboard(name):
+    # Imported once per process; later calls come from sys.modules
+    return importlib.import_module(DASHBOARDS[name])
 
 # Custom CSS for Dark Mode
 st.markdown(
@@ -38,23 +54,7 @@ with st.sidebar:
     st.markdown('<div class="subheader">Explore tourism trends, cultural heritage, and ecological insights.</div>', unsafe_allow_html=True)
     st.markdown("---")
 
-    page = st.selectbox("Choose a Dashboard", [
-        "📍 Tourist Hotspots",
-        "🏰 Protected Monuments",
-        "🌿 Eco-sensitive Zones",
-        "✈️ Foreign Tourist Arrivals",
-        "💰 Foreign Exchange Earnings (FEE)",
-        "🏞️ Domestic Tourist Visits (DTV)",
-    ])
+    page = st.selectbox("Choose a Dashboard", list(DASHBOARDS))
 
 # Dashboard routing
-dashboard_map = {
-    "📍 Tourist Hotspots": hotspots_dashboard,
-    "🏰 Protected Monuments": protected_monuments_dashboard,
-    "🌿 Eco-sensitive Zones": eco_sensitive_dashboard,
-    "✈️ Foreign Tourist Arrivals": fta_dashboard,
-    "💰 Foreign Exchange Earnings (FEE)": fee_dashboard,
-    "🏞️ Domestic Tourist Visits (DTV)": dtv_dashboard,
-}
-
-dashboard_map[page].show()
\ No newline at end of file
+load_dashboard(page).show()
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import re
+
+import pyarrow as pa
+
+# Gold KPI aggregate definitions, shared by the transformation stage that materializes
+# them (scripts/transformation/build_gold.py) and the dashboards that read them or rebuild
+# them in memory (dashboards/gold.py). A gold file is tagged with the silver_version of the
+# folder it was built from; the dashboards compare that tag to the same function's result.
+
+GOLD_DIR = "data/gold"
+
+# Logical dataset name -> measures (summed and counted) and the aggregates to build.
+# Group aggregates only cover rows whose keys are all non-null, like an isin() filter.
+GOLD_SPECS = {
+    "foreign_exchange_earnings_1991_2023": {
+        "measures": ["fee_in_terms_crore", "fee_in_us_terms_us_million",
+                     "fee_in_terms_change_over_previous_year", "fee_in_us_terms_change_over_previous_year"],
+        "prefix": "year",
+        "groups": [],
+    },
+    "eco_sensitive_zones_2015": {
+        "measures": ["number_of_complete_esz_proposals_with_the_ministry", "number_of_esz_proposals_approved_notified",
+                     "number_of_protected_areas_covered_under_the_approved_notified_esz_proposals",
+                     "number_of_esz_proposals_to_be_notified"],
+        "prefix": None,
+        "groups": [["state"]],
+    },
+    "number_of_visitors_to_centrally_protected_tickted_monuments_2019_20_2020_21": {
+        "measures": ["Domestic-2019-20", "Foreign-2019-20", "Domestic-2020-21", "Foreign-2020-21"],
+        "prefix": None,
+        "groups": [["Circle", "Name of the Monument "]],
+    },
+    "top_indian_places_to_visit": {
+        "measures": ["Google review rating", "Entrance Fee in INR", "time needed to visit in hrs",
+                     "Number of google review in lakhs"],
+        "prefix": None,
+        "groups": [["Zone", "Type"]],
+    },
+}
+
+
+def fingerprint(folder_path):
+    files = []
+    for dirpath, dirnames, filenames in os.walk(folder_path):
+        for filename in filenames:
+            if filename.endswith(".parquet"):
+                stat = os.stat(os.path.join(dirpath, filename))
+                files.append((os.path.relpath(os.path.join(dirpath, filename), folder_path),
+                              stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(files))
+
+
+def silver_version(folder_path):
+    # Short stable id of a silver folder's current files
+    return hashlib.sha1(repr(fingerprint(folder_path)).encode()).hexdigest()[:16]
+
+
+def aggregate_name(keys):
+    return "by_" + re.sub(r"\W+", "_", "_".join(keys)).strip("_")
+
+
+def aggregates(dataset):
+    # Aggregate name -> (keys, cumulative) for one dataset's spec
+    spec = GOLD_SPECS[dataset]
+    result = {aggregate_name([spec["prefix"]]): ([spec["prefix"]], True)} if spec["prefix"] else {}
+    for keys in spec["groups"]:
+        result[aggregate_name(keys)] = (keys, False)
+    return result
+
+
+def build_aggregate(df, keys, measures, cumulative=False, source_version=None):
+    grouped = df.groupby(keys, sort=True, observed=True)
+    out = grouped.size().rename("rows").to_frame()
+    for measure in measures:
+        out[f"{measure}__sum"] = grouped[measure].sum()
+        out[f"{measure}__count"] = grouped[measure].count()
+    if cumulative:
+        out = out.cumsum()
+    table = pa.Table.from_pandas(out.reset_index(), preserve_index=False)
+    metadata = {"keys": json.dumps(keys), "measures": json.dumps(measures), "cumulative": json.dumps(cumulative),
+                "source_version": source_version or ""}
+    return table.replace_schema_metadata(metadata)
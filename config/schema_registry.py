@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import re
+
+import pyarrow as pa
+
+# Loads the table contracts in table_schemas.json (silver table name -> ordered columns
+# with their Snowflake types) once, and derives from them everything that used to be
+# inferred per run: CSV read dtypes, the Arrow schema of silver outputs and the DDL.
+# Data that no longer fits its contract raises SchemaDriftError instead of quietly
+# turning into object/VARCHAR columns.
+
+SCHEMAS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "table_schemas.json")
+
+# Snowflake type -> column family; anything unlisted is treated as text
+TYPE_FAMILIES = [
+    (r"^(NUMBER|NUMERIC|DECIMAL)(\(\d+(,\s*0)?\))?$|^(INT|INTEGER|BIGINT|SMALLINT|TINYINT|BYTEINT)$", "int"),
+    (r"^(NUMBER|NUMERIC|DECIMAL)|^(FLOAT|DOUBLE|REAL)", "float"),
+    (r"^BOOLEAN$", "bool"),
+    (r"^TIMESTAMP", "timestamp"),
+]
+
+# Int columns are read as float64 so a fractional median fill cannot fail mid-transform;
+# transform_dataframe narrows whole-valued ones back to int64 afterwards
+READ_DTYPES = {"int": "float64", "float": "float64", "bool": "boolean", "text": str}
+
+# Columns identifying a row across reloads, used to MERGE changed data into the warehouse.
+# Tables not listed here are replaced whole when their data changes.
+NATURAL_KEYS = {
+    "domestic_tour_travels_2018_2022_d6a26721_d98c1689": ["year"],
+    "eco_sensitive_zones_2015_bfd2221e_d85d75dc": ["state"],
+    "foreign_exchange_earnings_1991_2023_48bdf5cd_54a21847": ["year"],
+    "foreign_tourist_arrivals_1981_2020_f9158194_eb71304f": ["year"],
+    "inbound_tourism_foreign_tourist_arrivals_of_non_resident_indians_and_int_7958d941": ["year"],
+    "month_wise_break_up_of_non_residents_indians_arrivals_2018_2020_c1f4090c_3b9627b4": ["months"],
+    "monuments_funding_2016_2021_e9e638f4_75d463ea": ["_year"],
+    "seasonal_temperature_1901_2019_7a6a9b18_8e666b4b": ["year"],
+    "state_fairs_festivals_2014_2021_337926d0_cb05aed2": ["name_of_state_ut", "_year", "name_of_fairs_and_festivals"],
+    "state_ut_wise_number_of_beneficiaries_and_funds_released_for_preservatio_0d1075ae": ["state_ut"],
+    "year_wise_details_of_funds_allocated_by_the_archaeological_survey_of_ind_36e6523a": ["_year"],
+}
+
+
+class SchemaDriftError(ValueError):
+    pass
+
+
+def silver_folder_name(name):
+    clean_name = name.lower().replace("-", "_").replace(" ", "_")
+    short_hash = hashlib.md5(clean_name.encode()).hexdigest()[:8]
+    return clean_name[:80] + "_" + short_hash
+
+
+def logical_name(folder_name):
+    # Silver folder name without its hash suffix; the name datasets are catalogued under
+    return re.sub(r"_[0-9a-f]{8}$", "", folder_name)
+
+
+def sanitize_table_name(name):
+    name = name.lower().replace(" ", "_").replace("-", "_").replace(",", "_")
+    short_hash = hashlib.md5(name.encode()).hexdigest()[:8]
+    return f"{name[:72]}_{short_hash}"
+
+
+def type_family(snowflake_type):
+    for pattern, family in TYPE_FAMILIES:
+        if re.match(pattern, snowflake_type.strip().upper()):
+            return family
+    return "text"
+
+
+def arrow_family(pa_type):
+    if pa.types.is_dictionary(pa_type):
+        pa_type = pa_type.value_type
+    if pa.types.is_integer(pa_type):
+        return "int"
+    if pa.types.is_floating(pa_type) or pa.types.is_decimal(pa_type):
+        return "float"
+    if pa.types.is_boolean(pa_type):
+        return "bool"
+    if pa.types.is_timestamp(pa_type) or pa.types.is_date(pa_type):
+        return "timestamp"
+    return "text"
+
+
+class TableSchema:
+    def __init__(self, table_name, columns):
+        self.table_name = table_name
+        self.columns = [(col["column_name"], col["type"]) for col in columns]
+        self.families = {name: type_family(sf_type) for name, sf_type in self.columns}
+        self.natural_keys = NATURAL_KEYS.get(table_name, [])
+
+    @property
+    def column_names(self):
+        return [name for name, _ in self.columns]
+
+    def read_dtypes(self):
+        # Explicit pandas dtypes for read_csv, so nothing is inferred from the data
+        return {name: READ_DTYPES.get(family, str) for name, family in self.families.items()}
+
+    def ddl(self, table_name=None):
+        column_defs = ",\n    ".join(f'"{name}" {sf_type}' for name, sf_type in self.columns)
+        return f'CREATE TABLE IF NOT EXISTS "{table_name or self.table_name}" (\n    {column_defs}\n);'
+
+    def conform_schema(self, schema):
+        # Columns must match the contract exactly; each Arrow type keeps its width as long
+        # as its family matches (ints may widen to float). Returns the pinned schema.
+        names = schema.names
+        missing = [name for name in self.column_names if name not in names]
+        extra = [name for name in names if name not in self.families]
+        if missing or extra:
+            raise SchemaDriftError(f"{self.table_name}: missing columns {missing}, unexpected columns {extra}")
+        fields = []
+        for name, family in self.families.items():
+            pa_type = schema.field(name).type
+            actual = arrow_family(pa_type)
+            if actual == family:
+                fields.append(pa.field(name, pa_type))
+            elif actual == "int" and family == "float":
+                fields.append(pa.field(name, pa.float64()))
+            else:
+                raise SchemaDriftError(f"{self.table_name}.{name}: contract says {family}, data is {pa_type}")
+        return pa.schema(fields, metadata=schema.metadata)
+
+    def conform(self, table):
+        schema = self.conform_schema(table.schema)
+        return table.select(schema.names).cast(schema)
+
+
+class SchemaRegistry:
+    def __init__(self, path=SCHEMAS_PATH):
+        self.path = path
+        with open(path, encoding="utf-8") as f:
+            self.tables = {name: TableSchema(name, columns) for name, columns in json.load(f).items()}
+
+    def get(self, table_name):
+        return self.tables.get(table_name)
+
+    def for_dataset(self, dataset_name):
+        # Bronze file stem -> contract of the silver table it becomes (None if unregistered)
+        return self.get(sanitize_table_name(silver_folder_name(dataset_name)))
+
+    def for_silver_folder(self, folder_name):
+        return self.get(sanitize_table_name(folder_name))
+
+
+_registry = None
+
+
+def get_registry(path=SCHEMAS_PATH):
+    # Loaded once per process
+    global _registry
+    if _registry is None or _registry.path != path:
+        _registry = SchemaRegistry(path)
+    return _registry
@@ -7,4 +7,21 @@ SNOWFLAKE_ACCOUNT = os.getenv("SNOWFLAKE_ACCOUNT")
 SNOWFLAKE_WAREHOUSE = os.getenv("SNOWFLAKE_WAREHOUSE")
 SNOWFLAKE_DATABASE = os.getenv("SNOWFLAKE_DATABASE")
 SNOWFLAKE_SCHEMA = os.getenv("SNOWFLAKE_SCHEMA")
-SNOWFLAKE_ROLE=os.getenv('SNOWFLAKE_ROLE')
\ No newline at end of file
+SNOWFLAKE_ROLE=os.getenv('SNOWFLAKE_ROLE')
+
+
+def connect(**options):
+    # Imported here so modules that only read the settings don't need the connector.
+    # `options` are passed through to the connector (e.g. paramstyle="qmark")
+    import snowflake.connector
+
+    return snowflake.connector.connect(
+        user=SNOWFLAKE_USER,
+        password=SNOWFLAKE_PASSWORD,
+        account=SNOWFLAKE_ACCOUNT,
+        warehouse=SNOWFLAKE_WAREHOUSE,
+        database=SNOWFLAKE_DATABASE,
+        schema=SNOWFLAKE_SCHEMA,
+        role=SNOWFLAKE_ROLE,
+        **options
+    )
@@ -0,0 +1,69 @@
+import io
+import json
+import threading
+from collections import OrderedDict
+
+from dashboards.source import dataset_version
+
+# Process-wide cache of rendered charts, shared by every session. A chart is keyed on its
+# name, the version of the dataset it is drawn from and its normalized filter parameters,
+# so re-visiting a dashboard or toggling an unrelated widget reuses the PNG, while a
+# rebuilt dataset or a new filter renders afresh. Least recently used charts are evicted
+# once the cache holds more than CHART_CACHE_MB.
+#   st.image(chart_png("fee_trends", DATASET, {"years": year_range}, lambda: plot_fee_trends(df)))
+
+CHART_CACHE_MB = 64
+DPI = 100
+
+_charts = OrderedDict()
+_size = 0
+_lock = threading.Lock()
+
+
+def normalize(params):
+    # Same filters in any order or container type -> same key
+    def canonical(value):
+        if isinstance(value, dict):
+            return {str(k): canonical(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple, set, frozenset)) or hasattr(value, "tolist"):
+            items = [canonical(v) for v in (value.tolist() if hasattr(value, "tolist") else value)]
+            return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+        return value
+    return json.dumps(canonical(params), sort_keys=True, default=str)
+
+
+def render_png(fig):
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=DPI, bbox_inches="tight", facecolor=fig.get_facecolor())
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def chart_png(name, dataset, params, render):
+    # render() builds the matplotlib figure; it only runs on a cache miss
+    global _size
+    key = (name, dataset_version(dataset), normalize(params))
+    with _lock:
+        png = _charts.get(key)
+        if png is not None:
+            _charts.move_to_end(key)
+            return png
+
+    png = render_png(render())
+    with _lock:
+        if key not in _charts:
+            _charts[key] = png
+            _size += len(png)
+        while _size > CHART_CACHE_MB * 1024 * 1024 and len(_charts) > 1:
+            _, evicted = _charts.popitem(last=False)
+            _size -= len(evicted)
+    return png
+
+
+def clear():
+    global _size
+    with _lock:
+        _charts.clear()
+        _size = 0
@@ -0,0 +1,68 @@
+import os
+import threading
+
+import pyarrow.compute as pc
+
+from config.gold_specs import fingerprint, silver_version
+from dashboards.silver_reader import read_silver_table, resolve_dataset, to_expression
+
+# Process-wide cache of silver datasets as Arrow tables, shared by every dashboard and
+# every Streamlit session. A dataset is read once and re-read only when its files change
+# (any Parquet file added, removed, or with a new mtime or size), e.g. after clean_data.py
+# rebuilds it. Arrow tables are immutable, so callers get zero-copy column/row views of
+# the shared table, or a pandas frame of their own that they are free to modify.
+# Datasets are named by logical name (see silver_reader.resolve_dataset) or folder path.
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def dataset_version(folder_path):
+    # Short stable id of a dataset's current files, for keying anything derived from it
+    return silver_version(resolve_dataset(folder_path))
+
+
+def get_table(folder_path):
+    folder_path = resolve_dataset(folder_path)
+    key = os.path.abspath(folder_path)
+    current = fingerprint(folder_path)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == current:
+            return cached[1]
+    # Read outside the lock so one slow dataset does not block the others
+    table = read_silver_table(folder_path)
+    with _lock:
+        _cache[key] = (current, table)
+    return table
+
+
+def get_view(folder_path, columns=None, filters=None):
+    # Read-only Arrow view: projection is zero-copy, filters use the pyarrow DNF form
+    table = get_table(folder_path)
+    if filters:
+        table = table.filter(to_expression(filters))
+    return table.select(columns) if columns is not None else table
+
+
+def get_frame(folder_path, columns=None, filters=None):
+    # A new pandas frame per call, never shared with other dashboards or sessions
+    return get_view(folder_path, columns, filters).to_pandas()
+
+
+def column_range(folder_path, column, filters=None):
+    result = pc.min_max(get_view(folder_path, [column], filters).column(column))
+    return result["min"].as_py(), result["max"].as_py()
+
+
+def column_values(folder_path, column, filters=None):
+    values = pc.unique(get_view(folder_path, [column], filters).column(column))
+    return sorted(value for value in values.to_pylist() if value is not None)
+
+
+def invalidate(folder_path=None):
+    with _lock:
+        if folder_path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(resolve_dataset(folder_path)), None)
@@ -1,12 +1,13 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+from dashboards.source import get_frame
 
 def show():
+    import plotly.express as px
+
     st.title("Tourist Visit Trends in India (2018–2022)")
 
     # Load data
-    df = pd.read_parquet("data/silver/domestic_tour_travels_2018_2022_d6a26721/domestic_tour_travels_2018_2022_d6a26721.parquet")
+    df = get_frame("domestic_tour_travels_2018_2022")
 
     # Rename columns for clarity
     df = df.rename(columns={
@@ -1,21 +1,19 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from dashboards.chart_cache import chart_png
+from dashboards.source import column_values, get_frame, group_totals
 
-def load_data():
-    df = pd.read_parquet("data/silver/eco_sensitive_zones_2015_bfd2221e/eco_sensitive_zones_2015_bfd2221e.parquet")
+DATASET = "eco_sensitive_zones_2015"
+
+def load_data(states=None):
+    # The state selection filters the shared cached table, so widget changes never re-read the file
+    filters = [("state", "in", list(states))] if states else None
+    df = get_frame(DATASET, filters=filters)
     df.columns = df.columns.str.strip()
     return df
 
 def show():
     st.title("Eco-sensitive Zones (ESZ) Dashboard")
 
-    df = load_data()
-    if df is None or df.empty:
-        st.warning("No data available to display.")
-        return
-
     if "show_filters" not in st.session_state:
         st.session_state.show_filters = False
 
@@ -30,7 +28,7 @@ def show():
     # Sidebar filters only when toggled on
     if st.session_state.show_filters:
         with st.sidebar:
-            states = sorted(df['state'].dropna().unique())
+            states = column_values(DATASET, 'state')
             states_with_all = ["All"] + states
             selected_states = st.multiselect("Select States / UTs", options=states_with_all, default=["All"])
     else:
@@ -38,16 +36,21 @@ def show():
 
     # Handle "All" selection
     if "All" in selected_states or len(selected_states) == 0:
-        df_filtered = df.copy()
+        df_filtered = load_data()
     else:
-        df_filtered = df[df['state'].isin(selected_states)]
+        df_filtered = load_data(selected_states)
+    if df_filtered is None or df_filtered.empty:
+        st.warning("No data available to display.")
+        return
 
-    # Calculate KPIs
-    total_states = df_filtered['state'].nunique()
-    total_complete_proposals = df_filtered['number_of_complete_esz_proposals_with_the_ministry'].sum()
-    total_approved_notified = df_filtered['number_of_esz_proposals_approved_notified'].sum()
-    total_protected_areas = df_filtered['number_of_protected_areas_covered_under_the_approved_notified_esz_proposals'].sum()
-    total_to_be_notified = df_filtered['number_of_esz_proposals_to_be_notified'].sum()
+    # Calculate KPIs from the gold per-state partials
+    all_states = "All" in selected_states or len(selected_states) == 0
+    totals = group_totals(DATASET, ['state'], {'state': None if all_states else selected_states})
+    total_states = totals["groups"]
+    total_complete_proposals = totals["sums"]['number_of_complete_esz_proposals_with_the_ministry']
+    total_approved_notified = totals["sums"]['number_of_esz_proposals_approved_notified']
+    total_protected_areas = totals["sums"]['number_of_protected_areas_covered_under_the_approved_notified_esz_proposals']
+    total_to_be_notified = totals["sums"]['number_of_esz_proposals_to_be_notified']
 
     # Improved KPI layout with emojis and single row
     kpi_cols = st.columns(5)
@@ -63,15 +66,24 @@ def show():
         st.subheader("Raw Eco-sensitive Zones Data")
         st.dataframe(df_filtered.reset_index(drop=True))
 
-    plt.style.use('dark_background')
-
-    approved_palette = sns.color_palette("bright", n_colors=1)
-    protected_palette = sns.color_palette("pastel", n_colors=1)
+    # Charts are rendered once per dataset version and state selection
+    params = {"states": None if all_states else sorted(selected_states)}
 
     st.subheader("Approved / Notified ESZ Proposals by State / UT")
-    plt.figure(figsize=(10,6))
+    st.image(chart_png("esz_approved", DATASET, params, lambda: plot_approved(df_filtered)), use_container_width=True)
+
+    st.subheader("Protected Areas Covered Under Approved Proposals")
+    st.image(chart_png("esz_protected", DATASET, params, lambda: plot_protected_areas(df_filtered)), use_container_width=True)
+
+def plot_approved(df):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.style.use('dark_background')
+    approved_palette = sns.color_palette("bright", n_colors=1)
+    fig = plt.figure(figsize=(10,6))
     sns.barplot(
-        data=df_filtered.sort_values('number_of_esz_proposals_approved_notified', ascending=False),
+        data=df.sort_values('number_of_esz_proposals_approved_notified', ascending=False),
         x='state',
         y='number_of_esz_proposals_approved_notified',
         color=approved_palette[0]
@@ -80,13 +92,17 @@ def show():
     plt.xlabel("State / UT", color='white')
     plt.ylabel("Approved / Notified Proposals", color='white')
     plt.tight_layout()
-    st.pyplot(plt.gcf())
-    plt.clf()
+    return fig
 
-    st.subheader("Protected Areas Covered Under Approved Proposals")
-    plt.figure(figsize=(10,6))
+def plot_protected_areas(df):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.style.use('dark_background')
+    protected_palette = sns.color_palette("pastel", n_colors=1)
+    fig = plt.figure(figsize=(10,6))
     sns.barplot(
-        data=df_filtered.sort_values('number_of_protected_areas_covered_under_the_approved_notified_esz_proposals', ascending=False),
+        data=df.sort_values('number_of_protected_areas_covered_under_the_approved_notified_esz_proposals', ascending=False),
         x='state',
         y='number_of_protected_areas_covered_under_the_approved_notified_esz_proposals',
         color=protected_palette[0]
@@ -95,5 +111,4 @@ def show():
     plt.xlabel("State / UT", color='white')
     plt.ylabel("Protected Areas Covered", color='white')
     plt.tight_layout()
-    st.pyplot(plt.gcf())
-    plt.clf()
+    return fig
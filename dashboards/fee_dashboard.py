@@ -1,23 +1,21 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
+from dashboards.chart_cache import chart_png
+from dashboards.source import column_range, get_frame, year_totals
 
-def load_data():
-    filepath = "data/silver/foreign_exchange_earnings_1991_2023_48bdf5cd/foreign_exchange_earnings_1991_2023_48bdf5cd.parquet"
+DATASET = "foreign_exchange_earnings_1991_2023"
+
+def load_data(year_range=None):
+    # The year range filters the shared cached table, so widget changes never re-read the file
+    filters = [("year", ">=", year_range[0]), ("year", "<=", year_range[1])] if year_range else None
     try:
-        df = pd.read_parquet(filepath)
+        df = get_frame(DATASET, filters=filters)
     except Exception as e:
-        st.error(f"Failed to load data from {filepath}: {e}")
+        st.error(f"Failed to load data from {DATASET}: {e}")
         return None
-    return df
+    return df.sort_values('year').reset_index(drop=True)
 
 def show():
     st.title("Foreign Exchange Earnings (FEE) Dashboard")
-    
-    df = load_data()
-    if df is None or df.empty:
-        st.warning("No data available to display.")
-        return
 
     # Initialize session state for filter toggle
     if 'show_filters' not in st.session_state:
@@ -28,13 +26,20 @@ def show():
         st.session_state.show_filters = not st.session_state.show_filters
 
     # Apply filters only if toggled on
+    year_range = None
     if st.session_state.show_filters:
-        years = df['year'].sort_values().unique()
-        min_year, max_year = int(years.min()), int(years.max())
+        try:
+            min_year, max_year = column_range(DATASET, 'year')
+        except Exception as e:
+            st.error(f"Failed to load data from {DATASET}: {e}")
+            return
+        min_year, max_year = int(min_year), int(max_year)
         year_range = st.sidebar.slider("Select Year Range", min_year, max_year, (min_year, max_year))
-        df_filtered = df[(df['year'] >= year_range[0]) & (df['year'] <= year_range[1])]
-    else:
-        df_filtered = df
+
+    df_filtered = load_data(year_range)
+    if df_filtered is None or df_filtered.empty:
+        st.warning("No data available to display.")
+        return
 
     # Checkbox for showing raw data in sidebar
     show_raw = st.sidebar.checkbox("Show Raw Data")
@@ -43,30 +48,30 @@ def show():
         st.subheader("Raw Foreign Exchange Earnings Data")
         st.dataframe(df_filtered.reset_index(drop=True))
     
-    # KPIs
+    # KPIs, from the gold running totals over year
     st.subheader("Key Performance Indicators")
     kpi_col1, kpi_col2, kpi_col3, kpi_col4 = st.columns(4)
+    totals = year_totals(DATASET, *(year_range or (None, None)))
     
-    total_fee_crore = df_filtered['fee_in_terms_crore'].sum()
-    total_fee_usd = df_filtered['fee_in_us_terms_us_million'].sum()
+    total_fee_crore = totals["sums"]['fee_in_terms_crore']
+    total_fee_usd = totals["sums"]['fee_in_us_terms_us_million']
     
-    avg_growth_inr = df_filtered['fee_in_terms_change_over_previous_year'].mean()
-    avg_growth_usd = df_filtered['fee_in_us_terms_change_over_previous_year'].mean()
+    avg_growth_inr = totals["means"]['fee_in_terms_change_over_previous_year']
+    avg_growth_usd = totals["means"]['fee_in_us_terms_change_over_previous_year']
     
     kpi_col1.metric("Total FEE (Crore INR)", f"{total_fee_crore:,.0f}")
     kpi_col2.metric("Total FEE (Million USD)", f"{total_fee_usd:,.0f}")
     kpi_col3.metric("Avg. Yearly Growth (INR %)", f"{avg_growth_inr:.2f}%")
     kpi_col4.metric("Avg. Yearly Growth (USD %)", f"{avg_growth_usd:.2f}%")
     
-    # Plot trends
+    # Plot trends (rendered once per dataset version and year range)
     st.subheader("FEE Trends Over Time")
-    fig_trends = plot_fee_trends(df_filtered)
-    st.pyplot(fig_trends)
+    params = {"year_range": year_range}
+    st.image(chart_png("fee_trends", DATASET, params, lambda: plot_fee_trends(df_filtered)), use_container_width=True)
     
     # Plot yearly % changes
     st.subheader("Yearly % Change in FEE")
-    fig_changes = plot_fee_changes(df_filtered)
-    st.pyplot(fig_changes)
+    st.image(chart_png("fee_changes", DATASET, params, lambda: plot_fee_changes(df_filtered)), use_container_width=True)
     
     # Highlight years with dips/spikes
     st.subheader("Years with Significant Change (> ±30%)")
@@ -80,6 +85,8 @@ def show():
         st.write("No significant changes detected in selected year range.")
 
 def plot_fee_trends(df):
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(10,5))
     ax.plot(df['year'], df['fee_in_terms_crore'], marker='o', label='FEE (Crore INR)')
     ax.plot(df['year'], df['fee_in_us_terms_us_million'], marker='x', label='FEE (Million USD)')
@@ -92,6 +99,8 @@ def plot_fee_trends(df):
     return fig
 
 def plot_fee_changes(df):
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(10,5))
     ax.bar(df['year'] - 0.2, df['fee_in_terms_change_over_previous_year'], width=0.4, label='INR % Change')
     ax.bar(df['year'] + 0.2, df['fee_in_us_terms_change_over_previous_year'], width=0.4, label='USD % Change')
@@ -1,12 +1,13 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-@st.cache_data
-def load_data():
-    file_path = "data/silver/foreign_tourist_arrivals_1981_2020_f9158194/foreign_tourist_arrivals_1981_2020_f9158194.parquet"
-    df = pd.read_parquet(file_path)
+from dashboards.chart_cache import chart_png
+from dashboards.source import column_range, get_frame
+
+DATASET = "foreign_tourist_arrivals_1981_2020"
+
+def load_data(year_range=None):
+    # The year range filters the shared cached table, so widget changes never re-read the file
+    filters = [("year", ">=", year_range[0]), ("year", "<=", year_range[1])] if year_range else None
+    df = get_frame(DATASET, filters=filters).sort_values("year").reset_index(drop=True)
     df = df.rename(columns={
         "year": "Year",
         "ftas_in_india_in_million_": "FTA (Million)",
@@ -21,20 +22,17 @@ def load_data():
 def show():
     st.title("📊 Foreign Tourist Arrivals (FTA) in India (1981-2021)")
 
-    df = load_data()
-
     if 'show_filters' not in st.session_state:
         st.session_state.show_filters = False
 
     if st.sidebar.button("🔍 Show/Hide Filters"):
         st.session_state.show_filters = not st.session_state.show_filters
 
+    selected_years = None
     if st.session_state.show_filters:
-        year_min, year_max = int(df['Year'].min()), int(df['Year'].max())
-        selected_years = st.sidebar.slider("Select Year Range", year_min, year_max, (year_min, year_max))
-        filtered_df = df[(df['Year'] >= selected_years[0]) & (df['Year'] <= selected_years[1])]
-    else:
-        filtered_df = df
+        year_min, year_max = (int(year) for year in column_range(DATASET, 'year'))
+        selected_years = tuple(st.sidebar.slider("Select Year Range", year_min, year_max, (year_min, year_max)))
+    filtered_df = load_data(selected_years)
 
     # Checkbox for showing raw data in sidebar
     show_data = st.sidebar.checkbox("Show raw data")
@@ -49,20 +47,37 @@ def show():
     kpi4.metric(label="NRIs (Million)", value=f"{latest_data['NRIs (Million)']:.2f}")
     kpi5.metric(label="International Tourists (Million)", value=f"{latest_data['International Tourists (Million)']:.2f}")
 
-    plt.style.use('dark_background')
+    # Charts are rendered once per dataset version and year range
+    params = {"year_range": selected_years}
 
     st.subheader("Arrivals Over Years (in Millions)")
-    plt.figure(figsize=(12, 6))
+    st.image(chart_png("fta_arrivals", DATASET, params, lambda: plot_arrivals(filtered_df)), use_container_width=True)
+
+    st.subheader("Year-over-Year Percentage Changes")
+    st.image(chart_png("fta_changes", DATASET, params, lambda: plot_changes(filtered_df)), use_container_width=True)
+
+    if show_data:
+        st.dataframe(filtered_df)
+
+def plot_arrivals(filtered_df):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.style.use('dark_background')
+    fig = plt.figure(figsize=(12, 6))
     sns.lineplot(data=filtered_df, x='Year', y='FTA (Million)', marker='o', label='FTA')
     sns.lineplot(data=filtered_df, x='Year', y='NRIs (Million)', marker='o', label='NRIs')
     sns.lineplot(data=filtered_df, x='Year', y='International Tourists (Million)', marker='o', label='International Tourists')
     plt.ylabel("Arrivals (Million)")
     plt.grid(color='gray', linestyle='--', linewidth=0.7)
     plt.legend()
-    st.pyplot(plt.gcf())
-    plt.clf()
+    return fig
 
-    st.subheader("Year-over-Year Percentage Changes")
+def plot_changes(filtered_df):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.style.use('dark_background')
     fig, axs = plt.subplots(3, 1, figsize=(12, 10), sharex=True)
     fig.patch.set_facecolor('#121212')
 
@@ -92,8 +107,4 @@ def show():
         ax.set_xticklabels(ax.get_xticklabels(), rotation=45, color='white')
 
     plt.xlabel("Year", color='white')
-    st.pyplot(fig)
-    plt.clf()
-
-    if show_data:
-        st.dataframe(filtered_df)
+    return fig
@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from config.gold_specs import GOLD_DIR, GOLD_SPECS, aggregate_name, aggregates, build_aggregate
+from dashboards.data_access import dataset_version, get_frame
+
+# Gold layer: KPI aggregates defined in config/gold_specs.py and precomputed from silver by
+# scripts/transformation/build_gold.py, so dashboards answer a filter change by combining
+# a handful of partials instead of scanning rows.
+#   - "year" aggregates hold running totals ordered by year: any year range is the
+#     difference of two rows, found by binary search.
+#   - group aggregates hold one row of partial sums and counts per key combination: any
+#     multi-select subset is the sum of the matching rows.
+# Each file records the version of the silver data it was built from. A missing or stale
+# file is rebuilt in memory from the cached silver table, so results are always current.
+#   year_totals("foreign_exchange_earnings_1991_2023", 2000, 2010)["sums"]["fee_in_terms_crore"]
+#   group_totals("top_indian_places_to_visit", ["Zone", "Type"], {"Zone": ["Northern"]})["means"]
+
+_cache = {}
+_lock = threading.Lock()
+
+
+class Aggregate:
+    def __init__(self, table):
+        metadata = {k.decode(): v.decode() for k, v in table.schema.metadata.items()}
+        self.keys = json.loads(metadata["keys"])
+        self.measures = json.loads(metadata["measures"])
+        self.cumulative = json.loads(metadata["cumulative"])
+        self.key_values = {key: table.column(key).to_numpy(zero_copy_only=False) for key in self.keys}
+        self.values = {name: table.column(name).to_numpy(zero_copy_only=False)
+                       for name in table.column_names if name not in self.keys}
+
+    def totals(self, selected):
+        # selected: boolean mask over groups, or (start, end) positions into the running totals
+        if self.cumulative:
+            start, end = selected
+            pick = (lambda column: column[end - 1] - (column[start - 1] if start > 0 else 0)) if end > start \
+                else (lambda column: column[:0].sum())
+        else:
+            pick = lambda column: column[selected].sum()
+        values = {name: pick(column).item() for name, column in self.values.items()}
+        sums = {m: values[f"{m}__sum"] for m in self.measures}
+        counts = {m: values[f"{m}__count"] for m in self.measures}
+        return {
+            "rows": values["rows"],
+            "sums": sums,
+            "counts": counts,
+            "means": {m: sums[m] / counts[m] if counts[m] else float("nan") for m in self.measures},
+        }
+
+
+def load_aggregate(dataset, keys, gold_folder=GOLD_DIR):
+    name = aggregate_name(keys)
+    keys, cumulative = aggregates(dataset)[name]
+    version = dataset_version(dataset)
+    with _lock:
+        cached = _cache.get((dataset, name))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    path = os.path.join(gold_folder, dataset, name + ".parquet")
+    table = pq.read_table(path) if os.path.exists(path) else None
+    if table is None or table.schema.metadata.get(b"source_version", b"").decode() != version:
+        table = build_aggregate(get_frame(dataset, columns=keys + GOLD_SPECS[dataset]["measures"]), keys,
+                                GOLD_SPECS[dataset]["measures"], cumulative, version)
+    aggregate = Aggregate(table)
+    with _lock:
+        _cache[(dataset, name)] = (version, aggregate)
+    return aggregate
+
+
+def year_totals(dataset, start=None, end=None):
+    # Totals over start <= year <= end (either bound may be None)
+    aggregate = load_aggregate(dataset, [GOLD_SPECS[dataset]["prefix"]])
+    years = aggregate.key_values[aggregate.keys[0]]
+    lo = 0 if start is None else int(np.searchsorted(years, start, side="left"))
+    hi = len(years) if end is None else int(np.searchsorted(years, end, side="right"))
+    return aggregate.totals((lo, hi))
+
+
+def group_totals(dataset, keys, selections=None):
+    # Totals over the groups whose key values are all selected; a key missing from
+    # `selections` (or selected as None) is not filtered. Adds the number of groups matched.
+    aggregate = load_aggregate(dataset, keys)
+    mask = np.ones(len(aggregate.values["rows"]), dtype=bool)
+    for key, values in (selections or {}).items():
+        if values is not None:
+            mask &= np.isin(aggregate.key_values[key], list(values))
+    totals = aggregate.totals(mask)
+    totals["groups"] = int(mask.sum())
+    return totals
+
+
+def invalidate():
+    with _lock:
+        _cache.clear()
@@ -1,12 +1,12 @@
 import streamlit as st
-import pandas as pd
+from dashboards.source import get_frame, group_totals
 
 def show():
     st.title("📍 Top Indian Tourist Hotspots")
 
     # Read the data
-    data_path = "data/silver/top_indian_places_to_visit_2be00d71/top_indian_places_to_visit_2be00d71.parquet"
-    data = pd.read_parquet(data_path)
+    dataset = "top_indian_places_to_visit"
+    data = get_frame(dataset)
 
     # Clean column names
     data.columns = data.columns.str.strip()
@@ -39,12 +39,13 @@ def show():
         data["Zone"].isin(selected_zones) & data["Type"].isin(selected_types)
     ]
 
-    # KPIs
-    total_places = filtered_data.shape[0]
-    avg_rating = filtered_data["Google review rating"].mean() if total_places > 0 else 0
-    avg_fee = filtered_data["Entrance Fee in INR"].mean() if total_places > 0 else 0
-    avg_visit_time = filtered_data["time needed to visit in hrs"].mean() if total_places > 0 else 0
-    total_google_reviews = filtered_data["Number of google review in lakhs"].sum() if total_places > 0 else 0
+    # KPIs, from the gold per-(zone, type) partials
+    totals = group_totals(dataset, ["Zone", "Type"], {"Zone": selected_zones, "Type": selected_types})
+    total_places = totals["rows"]
+    avg_rating = totals["means"]["Google review rating"] if total_places > 0 else 0
+    avg_fee = totals["means"]["Entrance Fee in INR"] if total_places > 0 else 0
+    avg_visit_time = totals["means"]["time needed to visit in hrs"] if total_places > 0 else 0
+    total_google_reviews = totals["sums"]["Number of google review in lakhs"] if total_places > 0 else 0
 
     # Display KPIs horizontally
     kpi1, kpi2, kpi3, kpi4, kpi5 = st.columns(5)
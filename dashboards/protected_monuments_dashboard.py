@@ -1,13 +1,16 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
+from dashboards.source import get_frame, group_totals
+
+DATASET = "number_of_visitors_to_centrally_protected_tickted_monuments_2019_20_2020_21"
 
 def load_data():
-    df = pd.read_parquet("data/silver/number_of_visitors_to_centrally_protected_tickted_monuments_2019_20_2020_21_22eeb0f5/number_of_visitors_to_centrally_protected_tickted_monuments_2019_20_2020_21_22eeb0f5.parquet")
+    df = get_frame(DATASET)
     df.columns = df.columns.str.strip()  # Clean column names
     return df
 
 def show():
+    import altair as alt
+
     st.title("🕌 Centrally Protected Monuments Visitor Dashboard")
 
     df = load_data()
@@ -24,6 +27,7 @@ def show():
     show_raw = st.sidebar.checkbox("Show Raw Data")
 
     # Filters section (conditionally shown)
+    selected_circle = selected_monument = "All"
     if st.session_state.show_filters:
         circles = sorted(df["Circle"].unique())
         selected_circle = st.sidebar.selectbox("Select Circle", ["All"] + circles)
@@ -38,13 +42,21 @@ def show():
     # ========== KPI Section ==========
     st.markdown("## 🔢 Key Performance Indicators")
 
-    total_domestic_2019 = df["Domestic-2019-20"].sum()
-    total_foreign_2019 = df["Foreign-2019-20"].sum()
-    total_domestic_2020 = df["Domestic-2020-21"].sum()
-    total_foreign_2020 = df["Foreign-2020-21"].sum()
-
-    domestic_drop_pct = ((total_domestic_2020 - total_domestic_2019) / total_domestic_2019) * 100
-    foreign_drop_pct = ((total_foreign_2020 - total_foreign_2019) / total_foreign_2019) * 100
+    # From the gold per-(circle, monument) partials; silver keeps the unstripped column name
+    totals = group_totals(DATASET, ["Circle", "Name of the Monument "], {
+        "Circle": None if selected_circle == "All" else [selected_circle],
+        "Name of the Monument ": None if selected_monument == "All" else [selected_monument],
+    })["sums"]
+    total_domestic_2019 = totals["Domestic-2019-20"]
+    total_foreign_2019 = totals["Foreign-2019-20"]
+    total_domestic_2020 = totals["Domestic-2020-21"]
+    total_foreign_2020 = totals["Foreign-2020-21"]
+
+    # Totals are plain Python numbers: a monument with no 2019-20 visitors shows nan, not a crash
+    domestic_drop_pct = ((total_domestic_2020 - total_domestic_2019) / total_domestic_2019) * 100 \
+        if total_domestic_2019 else float("nan")
+    foreign_drop_pct = ((total_foreign_2020 - total_foreign_2019) / total_foreign_2019) * 100 \
+        if total_foreign_2019 else float("nan")
 
     kpi1, kpi2, kpi3, kpi4 = st.columns(4)
 
@@ -73,8 +85,8 @@ def show():
 
     # ========== Top Monuments ==========
     st.subheader("🔥 Top 10 Most Visited Monuments (2019-20)")
-    df["Total Visitors 2019-20"] = df["Domestic-2019-20"] + df["Foreign-2019-20"]
-    top_10 = df.nlargest(10, "Total Visitors 2019-20")
+    totals = df.assign(**{"Total Visitors 2019-20": df["Domestic-2019-20"] + df["Foreign-2019-20"]})
+    top_10 = totals.nlargest(10, "Total Visitors 2019-20")
     st.bar_chart(top_10.set_index("Name of the Monument")["Total Visitors 2019-20"])
 
     # ========== Growth Table ==========
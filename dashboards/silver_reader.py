@@ -0,0 +1,203 @@
+import glob
+import json
+import os
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from config.schema_registry import logical_name
+
+# Reads a silver dataset folder, whether it holds one Parquet file or Hive partitions
+# written by clean_data.py --partition-by. Filters use the pyarrow DNF form, e.g.
+#   read_silver(folder, columns=["year", "fee_in_terms_crore"], filters=[("year", ">=", 2000)])
+# and are pushed down: partitions that cannot match are never opened, and inside a file
+# row groups are skipped on their min/max statistics. Only the listed columns are decoded.
+#
+# Datasets can be named by folder path or by logical name ("foreign_exchange_earnings_1991_2023",
+# the folder name without its hash suffix). Both are looked up in the _catalog.json written by
+# scripts/transformation/catalog.py, so listing and opening datasets needs no directory scans;
+# without a catalog everything falls back to listing the folders.
+
+SILVER_DIR = "data/silver"
+CATALOG_NAME = "_catalog.json"
+# Column profile written into each dataset folder by scripts/transformation/column_profile.py
+PROFILE_NAME = "_profile.json"
+
+_catalogs = {}
+_catalog_lock = threading.Lock()
+
+
+def load_catalog(base_folder=SILVER_DIR):
+    # Parsed once per catalog version (keyed on the file's mtime); None if there is no catalog
+    path = os.path.join(base_folder, CATALOG_NAME)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    key = os.path.abspath(base_folder)
+    with _catalog_lock:
+        cached = _catalogs.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    with open(path, encoding="utf-8") as f:
+        catalog = json.load(f)
+    with _catalog_lock:
+        _catalogs[key] = (mtime, catalog)
+    return catalog
+
+
+def catalog_entry(folder_path):
+    # Catalog entry for a dataset folder, looked up in the catalog of its parent directory
+    base_folder, folder_name = os.path.split(os.path.normpath(folder_path))
+    catalog = load_catalog(base_folder)
+    if catalog is None:
+        return None
+    # Datasets sharing a logical name are catalogued under their folder names instead
+    entry = catalog["datasets"].get(logical_name(folder_name)) or catalog["datasets"].get(folder_name)
+    return entry if entry is not None and entry["folder"] == folder_name else None
+
+
+def list_silver_datasets(base_folder=SILVER_DIR):
+    catalog = load_catalog(base_folder)
+    if catalog is not None:
+        return sorted(entry["folder"] for entry in catalog["datasets"].values())
+    # Folders starting with "_" or "." (staging, manifests) are not datasets
+    return sorted(
+        f for f in os.listdir(base_folder)
+        if os.path.isdir(os.path.join(base_folder, f)) and not f.startswith(("_", "."))
+    )
+
+
+def list_dataset_names(base_folder=SILVER_DIR):
+    # Logical names, for pickers
+    catalog = load_catalog(base_folder)
+    if catalog is not None:
+        return sorted(catalog["datasets"])
+    return [logical_name(folder) for folder in list_silver_datasets(base_folder)]
+
+
+def resolve_dataset(name, base_folder=SILVER_DIR):
+    # Logical name or folder path -> folder path
+    if os.path.isdir(name):
+        return name
+    catalog = load_catalog(base_folder)
+    if catalog is not None and name in catalog["datasets"]:
+        return os.path.join(base_folder, catalog["datasets"][name]["folder"])
+    for folder in list_silver_datasets(base_folder) if os.path.isdir(base_folder) else []:
+        if logical_name(folder) == name:
+            return os.path.join(base_folder, folder)
+    raise FileNotFoundError(f"No silver dataset named {name!r} in {base_folder}")
+
+
+def open_silver(folder_path):
+    folder_path = resolve_dataset(folder_path)
+    entry = catalog_entry(folder_path)
+    files = [os.path.join(folder_path, f["path"]) for f in entry["files"]] if entry is not None else []
+    if not files or not all(os.path.exists(path) for path in files):
+        files = sorted(glob.glob(os.path.join(folder_path, "**", "*.parquet"), recursive=True))
+    if not files:
+        raise FileNotFoundError(f"No parquet files found in {folder_path}")
+    return ds.dataset(files, format="parquet", partitioning="hive", partition_base_dir=folder_path)
+
+
+def to_expression(filters):
+    return pq.filters_to_expression(filters) if filters else None
+
+
+def read_silver_table(folder_path, columns=None, filters=None):
+    return open_silver(folder_path).to_table(columns=columns, filter=to_expression(filters))
+
+
+def read_silver(folder_path, columns=None, filters=None):
+    return read_silver_table(folder_path, columns, filters).to_pandas()
+
+
+def column_range(folder_path, column, filters=None):
+    # Min and max of one column, reading nothing but that column
+    result = pc.min_max(read_silver_table(folder_path, [column], filters).column(column))
+    return result["min"].as_py(), result["max"].as_py()
+
+
+def column_values(folder_path, column, filters=None):
+    values = pc.unique(read_silver_table(folder_path, [column], filters).column(column))
+    return sorted(value for value in values.to_pylist() if value is not None)
+
+
+def row_groups(dataset):
+    # (fragment, row group id, first row, row count) for every row group, in read order.
+    # Only Parquet footers are read.
+    result = []
+    start = 0
+    for fragment in dataset.get_fragments():
+        for row_group in fragment.row_groups:
+            result.append((fragment, row_group.id, start, row_group.num_rows))
+            start += row_group.num_rows
+    return result
+
+
+def read_row_groups(dataset, groups, columns=None):
+    # Partition columns are filled in from each fragment's partition path
+    tables = [fragment.subset(row_group_ids=[rg_id]).to_table(schema=dataset.schema, columns=columns)
+              for fragment, rg_id, _, _ in groups]
+    if not tables:
+        return dataset.schema.empty_table().select(columns) if columns is not None else dataset.schema.empty_table()
+    return pa.concat_tables(tables)
+
+
+def read_profile(folder_path):
+    # None for datasets cleaned before profiles existed
+    try:
+        with open(os.path.join(resolve_dataset(folder_path), PROFILE_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def dataset_rows(folder_path):
+    entry = catalog_entry(resolve_dataset(folder_path))
+    return entry["rows"] if entry is not None else open_silver(folder_path).count_rows()
+
+
+def read_page(folder_path, offset, limit, columns=None):
+    # Rows [offset, offset + limit) in read_silver order, decoding only the row groups
+    # that overlap the page and only the requested columns
+    dataset = open_silver(folder_path)
+    groups = [g for g in row_groups(dataset) if g[2] < offset + limit and g[2] + g[3] > offset]
+    table = read_row_groups(dataset, groups, columns)
+    first = groups[0][2] if groups else offset
+    return table.slice(offset - first, limit).to_pandas()
+
+
+def sample_rows(folder_path, n, columns=None, seed=0):
+    # Uniform random sample of n rows (all rows if there are fewer), kept in file order.
+    # Reads only the row groups the sampled rows fall in.
+    dataset = open_silver(folder_path)
+    groups = row_groups(dataset)
+    total = sum(g[3] for g in groups)
+    if total <= n:
+        return read_row_groups(dataset, groups, columns).to_pandas()
+    picked = np.sort(np.random.default_rng(seed).choice(total, size=n, replace=False))
+    starts = np.array([g[2] for g in groups])
+    owner = np.searchsorted(starts, picked, side="right") - 1
+    needed = sorted(set(owner.tolist()))
+    table = read_row_groups(dataset, [groups[i] for i in needed], columns)
+    # Positions of the sampled rows inside the concatenated row groups
+    offsets = np.cumsum([0] + [groups[i][3] for i in needed])[:-1]
+    local = dict(zip(needed, offsets))
+    indices = picked - starts[owner] + np.array([local[i] for i in owner.tolist()])
+    return table.take(pa.array(indices)).to_pandas()
+
+
+def numeric_columns(schema):
+    return [f.name for f in schema if pa.types.is_integer(f.type) or pa.types.is_floating(f.type)]
+
+
+def category_columns(schema):
+    # Strings, plain or dictionary-encoded by the silver writer
+    return [f.name for f in schema
+            if pa.types.is_string(f.type) or pa.types.is_large_string(f.type)
+            or (pa.types.is_dictionary(f.type) and pa.types.is_string(f.type.value_type))]
@@ -0,0 +1,23 @@
+import os
+
+# Where the dashboards read from, chosen per process with DASHBOARD_SOURCE:
+#   silver     (default) local silver Parquet through data_access, KPIs from the gold layer
+#   snowflake  the warehouse tables, through dashboards/warehouse_source.py
+#   duckdb     the local stand-in warehouse (WAREHOUSE_DUCKDB_PATH, default data/warehouse.duckdb)
+# Dashboards import their data functions from here, never from a backend directly.
+
+SOURCE = os.getenv("DASHBOARD_SOURCE", "silver")
+
+if SOURCE == "silver":
+    from dashboards.data_access import column_range, column_values, dataset_version, get_frame
+    from dashboards.gold import group_totals, year_totals
+else:
+    from dashboards.warehouse_source import DUCKDB_PATH, get_source
+
+    _source = get_source(SOURCE, path=os.getenv("WAREHOUSE_DUCKDB_PATH", DUCKDB_PATH))
+    get_frame = _source.get_frame
+    column_range = _source.column_range
+    column_values = _source.column_values
+    dataset_version = _source.dataset_version
+    year_totals = _source.year_totals
+    group_totals = _source.group_totals
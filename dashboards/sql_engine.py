@@ -0,0 +1,119 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import duckdb
+
+from dashboards.data_access import dataset_version
+from dashboards.silver_reader import SILVER_DIR, list_dataset_names, open_silver, resolve_dataset
+
+# Embedded DuckDB over the silver Parquet files, for ad-hoc SQL in the explorer. Every silver
+# dataset is a view named after its logical name, so datasets can be joined on year/state:
+#   run_query('SELECT * FROM "foreign_exchange_earnings_1991_2023" f '
+#             'JOIN "foreign_tourist_arrivals_1981_2020" a USING (year)')
+# Queries scan the Parquet files directly (projection and filter pushdown, spilling to disk
+# past MEMORY_LIMIT); only the limited result is turned into a pandas frame. Results are
+# cached on the query text plus the versions of the datasets it mentions.
+# The database may only read files under the silver directory, and its configuration is
+# locked, so a query cannot call read_text/read_csv on other files the server can reach.
+
+MEMORY_LIMIT = "1GB"
+DEFAULT_LIMIT = 1_000
+DEFAULT_TIMEOUT = 30
+RESULT_CACHE_SIZE = 64
+
+
+class QueryTimeout(TimeoutError):
+    pass
+
+
+_con = None
+_views = {}
+_results = OrderedDict()
+_lock = threading.Lock()
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def connection(base_folder=SILVER_DIR):
+    # One in-process database; each query runs on its own cursor
+    global _con
+    with _lock:
+        if _con is None:
+            _con = duckdb.connect()
+            _con.execute(f"SET memory_limit = '{MEMORY_LIMIT}'")
+            _con.execute("SET allowed_directories = ?", [[os.path.abspath(base_folder) + os.sep]])
+            _con.execute("SET enable_external_access = false")
+            _con.execute("SET lock_configuration = true")
+        sync_views(_con, base_folder)
+        return _con
+
+
+def sync_views(con, base_folder):
+    # (Re)creates the view of every dataset whose files changed since it was registered
+    for name in list_dataset_names(base_folder):
+        folder_path = resolve_dataset(name, base_folder)
+        version = dataset_version(folder_path)
+        if _views.get(name) == version:
+            continue
+        paths = [os.path.abspath(path) for path in open_silver(folder_path).files]
+        files = ", ".join("'" + path.replace("'", "''") + "'" for path in paths)
+        con.execute(f"CREATE OR REPLACE VIEW {quote(name)} AS "
+                    f"SELECT * FROM read_parquet([{files}], hive_partitioning = true, union_by_name = true)")
+        _views[name] = version
+
+
+def list_tables(base_folder=SILVER_DIR):
+    # {view name: [(column, type), ...]} for the query panel
+    cursor = connection(base_folder).cursor()
+    try:
+        rows = cursor.execute("SELECT table_name, column_name, data_type FROM information_schema.columns "
+                              "ORDER BY table_name, ordinal_position").fetchall()
+    finally:
+        cursor.close()
+    tables = {}
+    for table, column, data_type in rows:
+        tables.setdefault(table, []).append((column, data_type))
+    return tables
+
+
+def normalize_query(sql):
+    sql = sql.strip().rstrip(";").strip()
+    if ";" in sql:
+        raise ValueError("Only one statement can be run at a time")
+    if not re.match(r"^(SELECT|WITH|FROM|VALUES)\b", sql, re.IGNORECASE):
+        raise ValueError("Only read-only queries (SELECT / WITH) are allowed")
+    return sql
+
+
+def run_query(sql, limit=DEFAULT_LIMIT, timeout=DEFAULT_TIMEOUT, base_folder=SILVER_DIR):
+    # Returns (frame of at most `limit` rows, whether more rows were available)
+    sql = normalize_query(sql)
+    con = connection(base_folder)
+    mentioned = sorted(name for name in _views if re.search(re.escape(name), sql))
+    key = (sql, limit, tuple((name, _views[name]) for name in mentioned))
+    with _lock:
+        if key in _results:
+            _results.move_to_end(key)
+            return _results[key]
+
+    cursor = con.cursor()
+    timer = threading.Timer(timeout, cursor.interrupt)
+    timer.start()
+    try:
+        df = cursor.execute(f"SELECT * FROM ({sql}) LIMIT {int(limit) + 1}").fetchdf()
+    except duckdb.InterruptException:
+        raise QueryTimeout(f"Query cancelled after {timeout}s")
+    finally:
+        timer.cancel()
+        cursor.close()
+
+    result = (df.head(limit), len(df) > limit)
+    with _lock:
+        _results[key] = result
+        while len(_results) > RESULT_CACHE_SIZE:
+            _results.popitem(last=False)
+    return result
@@ -0,0 +1,310 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config.gold_specs import GOLD_SPECS
+from config.schema_registry import get_registry, sanitize_table_name, silver_folder_name
+from dashboards.silver_reader import resolve_dataset
+
+# Dashboard data source backed by the warehouse tables that snowflake/upload_data.py loads,
+# instead of local silver Parquet. Same functions as data_access/gold (get_frame,
+# column_range, column_values, year_totals, group_totals, dataset_version), but every
+# filter and aggregate is pushed into SQL, so only results cross the network.
+#   - connections come from a small shared pool, opened on demand
+#   - results are cached locally for CACHE_TTL seconds, up to CACHE_MAX_ENTRIES
+#   - identical queries issued concurrently by several sessions run once
+# The "duckdb" backend reads the local stand-in database written by
+#   python snowflake/upload_data.py --backend duckdb
+# so the whole mode can be run and tested without a Snowflake account.
+
+POOL_SIZE = 4
+CACHE_TTL = 300
+CACHE_MAX_ENTRIES = 256
+DUCKDB_PATH = "data/warehouse.duckdb"
+LEDGER_TABLE = "_load_ledger"
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def snowflake_connection():
+    from config.snowflake_config import connect
+
+    # Same "?" placeholders as DuckDB, for these connections only: the loader's
+    # connections keep the connector's default pyformat "%s"
+    return connect(paramstyle="qmark")
+
+
+def duckdb_connections(path):
+    import duckdb
+
+    # One database handle; every pooled connection is a cursor on it
+    database = duckdb.connect(path, read_only=True)
+    return database.cursor
+
+
+class ConnectionPool:
+    def __init__(self, factory, size=POOL_SIZE):
+        self.factory = factory
+        self.size = size
+        self.idle = []
+        self.opened = 0
+        # Waiters are woken both when a connection is returned and when a failed one is
+        # dropped, since either frees a slot
+        self.available = threading.Condition()
+
+    def checkout(self):
+        # An idle connection, or None if the caller may open a new one
+        with self.available:
+            while not self.idle and self.opened >= self.size:
+                self.available.wait()  # all connections busy
+            if self.idle:
+                return self.idle.pop()
+            self.opened += 1
+            return None
+
+    def release(self, conn=None):
+        # Returns `conn` to the pool, or frees its slot when it is None
+        with self.available:
+            if conn is not None:
+                self.idle.append(conn)
+            else:
+                self.opened -= 1
+            self.available.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.checkout()
+        if conn is None:
+            try:
+                conn = self.factory()
+            except Exception:
+                self.release()
+                raise
+        try:
+            yield conn
+        except Exception:
+            # A failed query may leave the connection unusable; open a fresh one next time
+            try:
+                conn.close()
+            except Exception:
+                pass
+            self.release()
+            raise
+        else:
+            self.release(conn)
+
+
+class QueryCache:
+    # TTL + LRU result cache; concurrent misses on the same key share one computation
+    def __init__(self, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.in_flight = {}
+        self.lock = threading.Lock()
+
+    def get_or_run(self, key, run):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                return entry[1]
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = run()
+        except Exception as e:
+            with self.lock:
+                del self.in_flight[key]
+            future.set_exception(e)
+            raise
+        with self.lock:
+            del self.in_flight[key]
+            self.entries[key] = (time.monotonic() + self.ttl, result)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        future.set_result(result)
+        return result
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def plain_value(value):
+    # Snowflake returns NUMBER aggregates as Decimal; pandas cells come back as numpy scalars
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def to_expression(filters, params):
+    # pyarrow-style DNF filters -> SQL with "?" parameters appended to `params`
+    clauses = []
+    for column, op, value in filters or []:
+        op = "=" if op == "==" else op.upper()
+        if op in ("IN", "NOT IN"):
+            values = list(value)
+            if not values:
+                clauses.append("FALSE" if op == "IN" else "TRUE")
+                continue
+            clauses.append(f"{quote(column)} {op} ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        else:
+            clauses.append(f"{quote(column)} {op} ?")
+            params.append(value)
+    return " AND ".join(clauses) if clauses else "TRUE"
+
+
+class WarehouseSource:
+    def __init__(self, backend="duckdb", path=DUCKDB_PATH, pool_size=POOL_SIZE, ttl=CACHE_TTL,
+                 max_entries=CACHE_MAX_ENTRIES):
+        factory = snowflake_connection if backend == "snowflake" else duckdb_connections(path)
+        self.backend = backend
+        self.pool = ConnectionPool(factory, pool_size)
+        self.cache = QueryCache(ttl, max_entries)
+
+    def query(self, sql, params=()):
+        params = tuple(params)
+        return self.cache.get_or_run((sql, params), lambda: self.execute(sql, params))
+
+    def execute(self, sql, params=()):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, list(params))
+                columns = [column[0] for column in cursor.description]
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        for column in df.columns:
+            if df[column].dtype == object and any(isinstance(v, Decimal) for v in df[column].head(100)):
+                df[column] = df[column].astype(float)
+        return df
+
+    def table_name(self, dataset):
+        # Warehouse tables are named after the silver folder (see upload_data.py)
+        try:
+            folder_name = os.path.basename(os.path.normpath(resolve_dataset(dataset)))
+        except FileNotFoundError:
+            folder_name = silver_folder_name(dataset)
+        return sanitize_table_name(folder_name)
+
+    def table_for(self, dataset):
+        return quote(self.table_name(dataset))
+
+    def dataset_version(self, dataset):
+        # The load ledger's hash changes whenever a bulk load brings new data. Tables loaded
+        # without the ledger get a version that changes once per cache TTL.
+        sql = f'SELECT "file_hash" FROM {quote(LEDGER_TABLE)} WHERE "table_name" = ?'
+        params = (self.table_name(dataset),)
+
+        def run():
+            # A missing ledger is cached for the TTL like any result, instead of failing
+            # (and costing a pooled connection) on every page render
+            try:
+                return self.execute(sql, params)
+            except Exception:
+                return None
+
+        ledger = self.cache.get_or_run((sql, params), run)
+        if ledger is not None and len(ledger):
+            return ledger.iloc[0, 0]
+        return f"ttl-{int(time.time() // self.cache.ttl)}"
+
+    def order_by(self, dataset):
+        # The warehouse keeps no row order; dashboards take year deltas and draw year charts
+        # straight from the frame, so rows come back sorted on the table's natural keys
+        contract = get_registry().get(self.table_name(dataset))
+        if contract is not None and contract.natural_keys:
+            return ", ".join(quote(key) for key in contract.natural_keys)
+        return "ALL"
+
+    def get_frame(self, dataset, columns=None, filters=None):
+        params = []
+        where = to_expression(filters, params)
+        select = ", ".join(quote(col) for col in columns) if columns is not None else "*"
+        # A copy, so callers may modify it without touching the cached result
+        return self.query(f"SELECT {select} FROM {self.table_for(dataset)} WHERE {where} "
+                          f"ORDER BY {self.order_by(dataset)}", params).copy()
+
+    def column_range(self, dataset, column, filters=None):
+        params = []
+        where = to_expression(filters, params)
+        result = self.query(f"SELECT MIN({quote(column)}), MAX({quote(column)}) FROM {self.table_for(dataset)} "
+                            f"WHERE {where}", params)
+        return plain_value(result.iloc[0, 0]), plain_value(result.iloc[0, 1])
+
+    def column_values(self, dataset, column, filters=None):
+        params = []
+        where = to_expression(filters, params)
+        result = self.query(f"SELECT DISTINCT {quote(column)} FROM {self.table_for(dataset)} "
+                            f"WHERE {where} AND {quote(column)} IS NOT NULL ORDER BY 1", params)
+        return [plain_value(value) for value in result.iloc[:, 0]]
+
+    def totals(self, dataset, keys, filters):
+        # Same result shape as dashboards.gold: rows, per-measure sums/counts/means, groups
+        measures = GOLD_SPECS[dataset]["measures"]
+        params = []
+        where = " AND ".join([f"{quote(key)} IS NOT NULL" for key in keys] + [to_expression(filters, params)])
+        group = ", ".join(quote(key) for key in keys)
+        inner = ", ".join(["COUNT(*) AS r"] + [f"SUM({quote(m)}) AS s{i}, COUNT({quote(m)}) AS c{i}"
+                                               for i, m in enumerate(measures)])
+        outer = ", ".join(["COUNT(*)", "SUM(r)"] + [f"SUM(s{i}), SUM(c{i})" for i in range(len(measures))])
+        result = self.query(f"SELECT {outer} FROM (SELECT {group}, {inner} FROM {self.table_for(dataset)} "
+                            f"WHERE {where} GROUP BY {group}) g", params)
+        # Cell by cell: a row of mixed int/float columns would otherwise all become float
+        values = [plain_value(result.iloc[0, i]) for i in range(result.shape[1])]
+        values = [0 if v is None or v != v else v for v in values]
+        sums = {m: values[2 + 2 * i] for i, m in enumerate(measures)}
+        counts = {m: values[3 + 2 * i] for i, m in enumerate(measures)}
+        return {
+            "rows": values[1],
+            "sums": sums,
+            "counts": counts,
+            "means": {m: sums[m] / counts[m] if counts[m] else float("nan") for m in measures},
+            "groups": values[0],
+        }
+
+    def year_totals(self, dataset, start=None, end=None):
+        year = GOLD_SPECS[dataset]["prefix"]
+        filters = ([(year, ">=", start)] if start is not None else []) + ([(year, "<=", end)] if end is not None else [])
+        totals = self.totals(dataset, [year], filters)
+        del totals["groups"]
+        return totals
+
+    def group_totals(self, dataset, keys, selections=None):
+        filters = [(key, "in", list(values)) for key, values in (selections or {}).items() if values is not None]
+        return self.totals(dataset, keys, filters)
+
+
+_sources = {}
+_sources_lock = threading.Lock()
+
+
+def get_source(backend="duckdb", **kwargs):
+    # One source (pool + cache) per backend per process, shared by every session
+    with _sources_lock:
+        if backend not in _sources:
+            _sources[backend] = WarehouseSource(backend, **kwargs)
+        return _sources[backend]
@@ -1,5 +1,8 @@
+import argparse
 import os
 
+from dashboards.silver_reader import SILVER_DIR, load_catalog
+
 def print_directory_structure(start_path='.', indent=''):
     for item in os.listdir(start_path):
         item_path = os.path.join(start_path, item)
@@ -7,6 +10,24 @@ def print_directory_structure(start_path='.', indent=''):
         if os.path.isdir(item_path):
             print_directory_structure(item_path, indent + '    ')
 
+def print_silver_inventory(base_folder=SILVER_DIR):
+    # Straight from the catalog written by the clean stage, no directory walk
+    catalog = load_catalog(base_folder)
+    if catalog is None:
+        print(f"No catalog in {base_folder}, run scripts/transformation/catalog.py --output {base_folder}")
+        return
+    print(f"Silver datasets in {base_folder} (catalog built {catalog['built_at']}):\n")
+    for name, entry in sorted(catalog['datasets'].items()):
+        partitions = f", partitioned by {', '.join(entry['partition_columns'])}" if entry['partition_columns'] else ''
+        print(f"|-- {name}: {entry['rows']:,} rows, {len(entry['columns'])} columns, "
+              f"{len(entry['files'])} file(s), {entry['bytes'] / 1024:,.1f} KB{partitions}")
+
 if __name__ == '__main__':
-    print("Directory structure of current directory:\n")
-    print_directory_structure()
+    parser = argparse.ArgumentParser(description="Print the directory tree, or the silver dataset inventory")
+    parser.add_argument('--silver', nargs='?', const=SILVER_DIR, help="List silver datasets from their catalog")
+    args = parser.parse_args()
+    if args.silver:
+        print_silver_inventory(args.silver)
+    else:
+        print("Directory structure of current directory:\n")
+        print_directory_structure()
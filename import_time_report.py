@@ -0,0 +1,88 @@
+import argparse
+import subprocess
+import sys
+
+# Startup-time report: imports each module in a fresh interpreter with `python -X importtime`
+# and prints its total import time plus the packages that took longest to load, so a
+# dashboard that starts importing a plotting backend or pandas at module level shows up.
+#   python import_time_report.py
+#   python import_time_report.py --modules app_v3 dashboards.fee_dashboard --max-ms 500
+
+DEFAULT_MODULES = [
+    "streamlit",
+    "dashboards.data_access",
+    "dashboards.hotspots_dashboard",
+    "dashboards.protected_monuments_dashboard",
+    "dashboards.eco_sensitive_dashboard",
+    "dashboards.fta_dashboard",
+    "dashboards.fee_dashboard",
+    "dashboards.dtv_dashboard",
+    # Paid on a dashboard's first chart render, not at startup
+    "matplotlib.pyplot",
+    "seaborn",
+    "plotly.express",
+    "altair",
+]
+
+
+def import_times(module):
+    # (total microseconds, {package: self microseconds}) for one module imported from scratch
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise ImportError(errors[-1] if errors else f"import {module} failed")
+
+    # Children are listed before the import that pulled them in; keep the subtrees of the
+    # module's own top-level imports and drop interpreter startup (site, encodings, ...)
+    root = module.split(".")[0]
+    total = 0
+    packages = {}
+    pending = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if not line.startswith("import time:") or len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        self_us = int(parts[0].split(":")[1])
+        name = parts[2]
+        pending.append((name.strip().split(".")[0], self_us))
+        if len(name) - len(name.lstrip()) == 1:  # a top-level import
+            if name.strip().split(".")[0] == root:
+                total += int(parts[1])
+                for package, micros in pending:
+                    packages[package] = packages.get(package, 0) + micros
+            pending = []
+    return total, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report per-module import time in fresh interpreters")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument("--top", type=int, default=5, help="Slowest packages shown per module")
+    parser.add_argument("--max-ms", type=float, help="Exit non-zero if any module takes longer than this")
+    args = parser.parse_args()
+
+    over_budget = []
+    failed = []
+    for module in args.modules:
+        try:
+            total, packages = import_times(module)
+        except ImportError as e:
+            failed.append(module)
+            print(f"❌ {module}: {e}")
+            continue
+        total_ms = total / 1000
+        heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        print(f"⏱️ {module}: {total_ms:,.0f} ms")
+        for package, micros in heaviest:
+            print(f"    {package:<28} {micros / 1000:>8,.1f} ms")
+        if args.max_ms is not None and total_ms > args.max_ms:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"⚠️ Over {args.max_ms:,.0f} ms: {', '.join(over_budget)}")
+    raise SystemExit(1 if over_budget or failed else 0)
+
+
+if __name__ == "__main__":
+    main()
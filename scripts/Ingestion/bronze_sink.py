@@ -0,0 +1,116 @@
+import csv
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# Sinks append each page to "<output>.part" as it arrives and only rename it over the
+# real bronze file on commit(), so a failed run never clobbers the last good output
+# and never holds more than one page (or one Parquet row group) in memory.
+
+class CsvSink:
+    supports_resume = True
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.part_path = output_path + ".part"
+        self.rows = 0
+        self.bytes_written = 0
+        self.fieldnames = None
+        self.file = None
+        self.writer = None
+
+    def resume(self, fieldnames, part_bytes, rows):
+        # Drop anything written after the last checkpoint, then keep appending
+        with open(self.part_path, "r+b") as f:
+            f.truncate(part_bytes)
+        self.file = open(self.part_path, "a", newline="", encoding="utf-8")
+        self.fieldnames = list(fieldnames)
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames)
+        self.rows = rows
+        self.bytes_written = part_bytes
+
+    def write(self, records):
+        if not records:
+            return
+        if self.writer is None:
+            os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+            self.file = open(self.part_path, "w", newline="", encoding="utf-8")
+            self.fieldnames = list(records[0].keys())
+            self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames)
+            self.writer.writeheader()
+        self.writer.writerows(records)
+        self.file.flush()
+        self.rows += len(records)
+        self.bytes_written = os.fstat(self.file.fileno()).st_size
+
+    def commit(self):
+        self.close()
+        if self.rows:
+            os.replace(self.part_path, self.output_path)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class ParquetSink:
+    # Bronze stays untyped: every field is written as a string, exactly as the API returns it.
+    # An unfinished Parquet file has no footer and cannot be reopened, so there is no resume.
+    supports_resume = False
+
+    def __init__(self, output_path, row_group_size=10000):
+        self.output_path = output_path
+        self.part_path = output_path + ".part"
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self.bytes_written = 0
+        self.fieldnames = None
+        self.schema = None
+        self.writer = None
+        self.buffer = []
+
+    def write(self, records):
+        if not records:
+            return
+        if self.writer is None:
+            os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+            self.fieldnames = list(records[0].keys())
+            self.schema = pa.schema([(name, pa.string()) for name in self.fieldnames])
+            self.writer = pq.ParquetWriter(self.part_path, self.schema)
+        self.buffer.extend(records)
+        self.rows += len(records)
+        if len(self.buffer) >= self.row_group_size:
+            self._flush()
+
+    def commit(self):
+        self.close()
+        if self.rows:
+            os.replace(self.part_path, self.output_path)
+
+    def close(self):
+        if self.writer is not None:
+            self._flush()
+            self.writer.close()
+            self.writer = None
+
+    def _flush(self):
+        if not self.buffer:
+            return
+        columns = {
+            field.name: [None if r.get(field.name) is None else str(r.get(field.name)) for r in self.buffer]
+            for field in self.schema
+        }
+        self.writer.write_table(pa.table(columns, schema=self.schema))
+        self.buffer = []
+
+
+SINKS = {"csv": CsvSink, "parquet": ParquetSink}
+
+
+def open_sink(output_dir, dataset_name, fmt="csv"):
+    if fmt not in SINKS:
+        raise ValueError(f"Unsupported bronze format '{fmt}', expected one of: {', '.join(SINKS)}")
+    return SINKS[fmt](os.path.join(output_dir, f"{dataset_name}.{fmt}"))
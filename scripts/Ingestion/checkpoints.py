@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+MANIFEST_PATH = os.path.join("data", "bronze", "_manifest.json")
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CheckpointManifest:
+    # Per-dataset ingestion state, rewritten atomically after every page:
+    #   status        "partial" while fetching, "complete" once the bronze file is committed
+    #   last_offset   next API offset to request when resuming
+    #   part_bytes    size of the .part file at last_offset (anything beyond it is discarded)
+    #   record_count  rows written so far / in the committed file
+    #   total         record count reported by the API
+    #   updated       the API's "updated" timestamp for the resource
+    #   content_hash  sha256 of the committed bronze file
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def get(self, dataset_name):
+        with self.lock:
+            entry = self.entries.get(dataset_name)
+            return dict(entry) if entry else None
+
+    def update(self, dataset_name, **fields):
+        with self.lock:
+            entry = self.entries.setdefault(dataset_name, {})
+            entry.update(fields)
+            entry["checkpointed_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def is_unchanged(entry, resource_path, fmt, total, updated, output_path):
+    # Skip only when the API vouches for the data ("updated" is reported and matches)
+    # and the committed file on disk is still the one we hashed.
+    if not entry or entry.get("status") != "complete":
+        return False
+    if entry.get("resource_path") != resource_path or entry.get("format") != fmt:
+        return False
+    if updated is None or entry.get("updated") != updated or entry.get("total") != total:
+        return False
+    if not os.path.exists(output_path):
+        return False
+    return file_sha256(output_path) == entry.get("content_hash")
+
+
+def can_resume(entry, resource_path, fmt, total, updated, part_path):
+    # Resume only with evidence the data has not changed: matching "updated" timestamps,
+    # or, when the API did not report one on either run, a matching reported total
+    if not entry or entry.get("status") != "partial":
+        return False
+    if entry.get("resource_path") != resource_path or entry.get("format") != fmt:
+        return False
+    if updated is not None and entry.get("updated") is not None:
+        if entry.get("updated") != updated:
+            return False
+    elif total is None or entry.get("total") != total:
+        return False
+    if not entry.get("fieldnames"):
+        return False
+    return os.path.exists(part_path) and os.path.getsize(part_path) >= entry.get("part_bytes", 0)
@@ -1,15 +1,20 @@
 import requests
 import os
-import csv
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 import time
 
+from http_client import HostRateLimiter, make_session, get_with_retry
+from bronze_sink import SINKS, open_sink
+from checkpoints import MANIFEST_PATH, CheckpointManifest, can_resume, file_sha256, is_unchanged
+from paging import API_MAX_PAGE_SIZE, PageSizer, parse_total, plan_wave
+
 # Load environment variables
 load_dotenv()
 API_KEY = os.getenv("API_KEY")
-
-if not API_KEY:
-    raise ValueError("Missing API_KEY. Please set it in your .env file.")
+BASE_URL = os.getenv("DATA_GOV_BASE_URL", "https://api.data.gov.in")
+BRONZE_DIR = os.path.join("data", "bronze")
 
 # Dataset Name -> Resource Path
 resources_files = {
@@ -32,47 +37,168 @@ resources_files = {
     "seasonal_temperature_1901_2019": "/resource/e95bbab3-5fdb-4300-b9e8-15a328d90e6d"
 }
 
-# Loop through all datasets
-for dataset_name, resource_path in resources_files.items():
+def fetch_dataset(session, limiter, dataset_name, resource_path, api_key, base_url=BASE_URL,
+                  max_retries=5, page_workers=4, max_page_size=API_MAX_PAGE_SIZE, fmt="csv",
+                  manifest=None, full_refresh=False, bronze_dir=BRONZE_DIR):
     print(f"\n📥 Fetching data for: {dataset_name}")
-    offset = 0
-    limit = 100
-    all_records = []
-    row_exists = True
-    base_url = f"https://api.data.gov.in{resource_path}?api-key={API_KEY}&format=json&limit={limit}&offset="
-
-    while row_exists:
-        url = f"{base_url}{offset}"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            records = data.get("records", [])
-            if not records:
-                row_exists = False
-                break
-
-            all_records.extend(records)
-            print(f"✅ Fetched {len(records)} records at offset {offset}")
-            offset += limit
-            time.sleep(1)
-
-        except requests.RequestException as e:
-            print(f"❌ Error fetching {dataset_name}: {e}")
-            break
-
-    if not all_records:
+    started = time.perf_counter()
+    stats = {"dataset": dataset_name, "pages": 0, "rows": 0, "seconds": 0.0, "error": None, "skipped": False}
+    sink = open_sink(os.path.join(bronze_dir, dataset_name), dataset_name, fmt)
+    dataset_url = f"{base_url}{resource_path}?api-key={api_key}&format=json"
+    sizer = PageSizer(maximum=max_page_size)
+    manifest = manifest or CheckpointManifest(os.path.join(bronze_dir, "_manifest.json"))
+    entry = None if full_refresh else manifest.get(dataset_name)
+
+    def fetch_page(offset, limit):
+        url = f"{dataset_url}&limit={limit}&offset={offset}"
+        response = get_with_retry(session, url, limiter, max_retries=max_retries)
+        data = response.json()
+        sizer.observe(len(data.get("records", [])), response.request_seconds, len(response.content))
+        return data
+
+    # One cheap probe (a single record) returns the total record count and the
+    # resource's "updated" timestamp. Unchanged datasets stop here; an interrupted
+    # one resumes from its last checkpoint; anything else starts again at offset 0.
+    # The remaining offset ranges are fetched in parallel waves and stitched back
+    # together in offset order, so the output matches a sequential fetch. Once
+    # `total` is reached (or when it is not reported) we keep probing one page at a
+    # time until the API returns an empty page.
+    try:
+        probe = get_with_retry(session, f"{dataset_url}&limit=1&offset=0", limiter, max_retries=max_retries).json()
+        total = parse_total(probe)
+        updated = probe.get("updated")
+
+        if is_unchanged(entry, resource_path, fmt, total, updated, sink.output_path):
+            print(f"⏭️ {dataset_name} unchanged since last run, skipping")
+            stats["skipped"] = True
+            stats["rows"] = entry.get("record_count", 0)
+            stats["seconds"] = time.perf_counter() - started
+            return stats
+
+        offset = 0
+        if sink.supports_resume and can_resume(entry, resource_path, fmt, total, updated, sink.part_path):
+            sink.resume(entry["fieldnames"], entry["part_bytes"], entry["record_count"])
+            offset = entry["last_offset"]
+            print(f"⏯️ Resuming {dataset_name} at offset {offset} ({sink.rows} rows already saved)")
+
+        def checkpoint(status, **fields):
+            manifest.update(dataset_name, status=status, resource_path=resource_path, format=fmt,
+                            total=total, updated=updated, record_count=sink.rows, **fields)
+
+        with ThreadPoolExecutor(max_workers=page_workers) as pages:
+            while True:
+                limit = sizer.next_limit()
+                wave = plan_wave(offset, limit, total, page_workers)
+                finished = False
+                for page_offset, data in zip(wave, pages.map(lambda o: fetch_page(o, limit), wave)):
+                    records = data.get("records", [])
+                    if not records:
+                        finished = True
+                        break
+
+                    sink.write(records)
+                    stats["pages"] += 1
+                    offset = page_offset + len(records)
+                    checkpoint("partial", last_offset=offset, part_bytes=sink.bytes_written,
+                               fieldnames=sink.fieldnames)
+                    print(f"✅ [{dataset_name}] Fetched {len(records)} records at offset {page_offset}")
+                    if len(records) < limit and total is not None and offset < total:
+                        # Short page before the end: the server caps page size below `limit`.
+                        # Later pages of this wave would leave a gap, so drop them and replan.
+                        sizer.cap(len(records))
+                        break
+                if finished:
+                    break
+    except (requests.RequestException, ValueError, OSError) as e:
+        print(f"❌ Error fetching {dataset_name}: {e}")
+        stats["error"] = str(e)
+
+    if stats["error"]:
+        # Keep the pages fetched so far in the .part file; the last good bronze file stays in place
+        sink.close()
+        if sink.rows:
+            print(f"🧩 Kept {sink.rows} partial rows in {sink.part_path}")
+    elif not sink.rows:
         print(f"⚠️ No records found for {dataset_name}")
-        continue
+    else:
+        sink.commit()
+        checkpoint("complete", last_offset=offset, content_hash=file_sha256(sink.output_path))
+        print(f"💾 Saved {sink.rows} rows to {sink.output_path}")
+
+    stats["rows"] = sink.rows
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def print_summary(results, total_seconds):
+    print("\n📊 Ingestion summary")
+    for stats in sorted(results, key=lambda s: s["dataset"]):
+        pages_per_sec = stats["pages"] / stats["seconds"] if stats["seconds"] else 0.0
+        status = "❌" if stats["error"] else "⏭️" if stats["skipped"] else "✅"
+        print(f"{status} {stats['dataset']}: {stats['rows']} rows, {stats['pages']} pages "
+              f"in {stats['seconds']:.2f}s ({pages_per_sec:.2f} pages/s)")
+    print(f"⏱️ Total wall time: {total_seconds:.2f}s")
+
+
+def run_ingestion(resources, api_key, base_url=BASE_URL, workers=4, rate=2.0, burst=2, max_retries=5,
+                  page_workers=4, max_page_size=API_MAX_PAGE_SIZE, fmt="csv",
+                  manifest_path=MANIFEST_PATH, full_refresh=False, bronze_dir=BRONZE_DIR):
+    # Datasets are fetched concurrently over one pooled keep-alive session;
+    # the per-host token bucket replaces the old fixed sleep between pages.
+    manifest = CheckpointManifest(manifest_path)
+    limiter = HostRateLimiter(rate, burst)
+    session = make_session(pool_size=workers * page_workers)
+    started = time.perf_counter()
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(fetch_dataset, session, limiter, name, path, api_key, base_url,
+                                max_retries, page_workers, max_page_size, fmt, manifest, full_refresh,
+                                bronze_dir): name
+                for name, path in resources.items()
+            }
+            for future in as_completed(futures):
+                results.append(future.result())
+    finally:
+        session.close()
+    print_summary(results, time.perf_counter() - started)
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fetch data.gov.in resources into data/bronze")
+    parser.add_argument("--workers", type=int, default=4, help="Datasets fetched concurrently")
+    parser.add_argument("--rate", type=float, default=2.0, help="Requests per second allowed per host")
+    parser.add_argument("--burst", type=int, default=2, help="Token bucket burst size per host")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries on 429/5xx and connection errors")
+    parser.add_argument("--page-workers", type=int, default=4, help="Parallel page requests within one dataset")
+    parser.add_argument("--max-page-size", type=int, default=API_MAX_PAGE_SIZE, help="Upper bound for the adaptive page size")
+    parser.add_argument("--format", choices=sorted(SINKS), default="csv", help="Bronze output format")
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help="Checkpoint manifest used for resume/skip")
+    parser.add_argument("--full-refresh", action="store_true", help="Ignore checkpoints and re-download everything")
+    parser.add_argument("--base-url", default=BASE_URL, help="API base URL")
+    parser.add_argument("datasets", nargs="*", help="Subset of dataset names to fetch (default: all)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not API_KEY:
+        raise ValueError("Missing API_KEY. Please set it in your .env file.")
+
+    resources = resources_files
+    if args.datasets:
+        unknown = set(args.datasets) - set(resources_files)
+        if unknown:
+            raise ValueError(f"Unknown dataset(s): {', '.join(sorted(unknown))}")
+        resources = {name: resources_files[name] for name in args.datasets}
 
-    # Write to CSV
-    output_dir = os.path.join("data", "bronze", dataset_name)
-    os.makedirs(output_dir, exist_ok=True)
-    output_file_path = os.path.join(output_dir, f"{dataset_name}.csv")
+    run_ingestion(resources, API_KEY, base_url=args.base_url, workers=args.workers,
+                  rate=args.rate, burst=args.burst, max_retries=args.max_retries,
+                  page_workers=args.page_workers, max_page_size=args.max_page_size, fmt=args.format,
+                  manifest_path=args.manifest, full_refresh=args.full_refresh)
 
-    with open(output_file_path, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=all_records[0].keys())
-        writer.writeheader()
-        writer.writerows(all_records)
 
-    print(f"💾 Saved {len(all_records)} rows to {output_file_path}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Status codes worth retrying: rate limited or a transient server-side failure
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    # Allows `rate` requests per second on average with bursts of up to `burst`
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    # One token bucket per host, so every worker hitting the same API shares one budget
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        bucket.acquire()
+
+
+def make_session(pool_size=10):
+    # Keep-alive session whose connection pool is large enough for every worker thread
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def backoff_delay(attempt, base=1.0, cap=30.0):
+    # "Full jitter" exponential backoff
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def retry_after_seconds(response):
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def get_with_retry(session, url, limiter, max_retries=5, backoff_base=1.0, backoff_cap=30.0, timeout=30):
+    for attempt in range(max_retries + 1):
+        limiter.acquire(url)
+        started = time.perf_counter()
+        try:
+            response = session.get(url, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff_delay(attempt, backoff_base, backoff_cap)
+            print(f"🔁 {type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+            continue
+
+        if response.status_code in RETRY_STATUSES and attempt < max_retries:
+            delay = retry_after_seconds(response)
+            if delay is None:
+                delay = backoff_delay(attempt, backoff_base, backoff_cap)
+            print(f"🔁 HTTP {response.status_code}, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+            continue
+
+        response.raise_for_status()
+        # Network time only (excludes rate-limit waits and retries), used for page sizing
+        response.request_seconds = time.perf_counter() - started
+        return response
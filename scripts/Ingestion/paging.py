@@ -0,0 +1,70 @@
+import threading
+
+# Largest `limit` we ever ask the API for; a lower server-side cap is learned from short pages
+API_MAX_PAGE_SIZE = 10000
+
+
+class PageSizer:
+    # Picks the next page size from observed per-row latency and payload size.
+    # Pages grow towards whichever budget (time or bytes) is hit first, at most
+    # `growth`x per step, and never beyond the API maximum or a learned server cap.
+    def __init__(self, initial=100, maximum=API_MAX_PAGE_SIZE, target_seconds=2.0,
+                 target_bytes=4 * 1024 * 1024, growth=4, step=100, smoothing=0.5):
+        self.limit = initial
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.target_bytes = target_bytes
+        self.growth = growth
+        self.step = step
+        self.smoothing = smoothing
+        self.seconds_per_row = None
+        self.bytes_per_row = None
+        self.lock = threading.Lock()
+
+    def observe(self, rows, seconds, nbytes):
+        if rows <= 0:
+            return
+        with self.lock:
+            self.seconds_per_row = self._smooth(self.seconds_per_row, seconds / rows)
+            self.bytes_per_row = self._smooth(self.bytes_per_row, nbytes / rows)
+
+    def cap(self, server_limit):
+        # The server returned fewer rows than asked for mid-dataset: that is its real maximum
+        with self.lock:
+            self.maximum = max(1, min(self.maximum, server_limit))
+            self.limit = min(self.limit, self.maximum)
+
+    def next_limit(self):
+        with self.lock:
+            if self.seconds_per_row is None:
+                return self.limit
+            candidates = [self.maximum, self.limit * self.growth]
+            if self.seconds_per_row > 0:
+                candidates.append(self.target_seconds / self.seconds_per_row)
+            if self.bytes_per_row > 0:
+                candidates.append(self.target_bytes / self.bytes_per_row)
+            limit = int(min(candidates))
+            if self.step <= limit < self.maximum:
+                limit -= limit % self.step
+            self.limit = max(1, min(limit, self.maximum))
+            return self.limit
+
+    def _smooth(self, previous, value):
+        if previous is None:
+            return value
+        return self.smoothing * value + (1 - self.smoothing) * previous
+
+
+def parse_total(data):
+    # data.gov.in reports the full record count as "total" on every page
+    try:
+        return int(data.get("total"))
+    except (TypeError, ValueError):
+        return None
+
+
+def plan_wave(offset, limit, total, workers):
+    # Consecutive [offset, offset + limit) ranges for one round of parallel requests
+    if total is None or offset >= total:
+        return [offset]
+    return list(range(offset, total, limit)[:workers])
@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from fetch_data import API_KEY, BASE_URL, resources_files, run_ingestion
+from http_client import HostRateLimiter, get_with_retry, make_session
+
+# Offline stand-in for api.data.gov.in.
+#   record  captures every /resource/<id> of fetch_data.resources_files into one cassette per resource
+#   serve   answers /resource/<id>?offset=&limit= from the cassettes, with optional latency,
+#           injected 429/503 errors, a server-side page cap and an inflated row count
+#   bench   starts the stub in-process and runs the real ingestion against it into a temp dir
+CASSETTE_DIR = os.path.join("data", "replay")
+
+
+def cassette_path(cassette_dir, resource_path):
+    return os.path.join(cassette_dir, resource_path.rstrip("/").rsplit("/", 1)[-1] + ".json")
+
+
+def record(resources, api_key, cassette_dir=CASSETTE_DIR, base_url=BASE_URL, page_size=1000, rate=2.0):
+    os.makedirs(cassette_dir, exist_ok=True)
+    session = make_session()
+    limiter = HostRateLimiter(rate)
+    try:
+        for dataset_name, resource_path in resources.items():
+            dataset_url = f"{base_url}{resource_path}?api-key={api_key}&format=json"
+            meta, records, offset = None, [], 0
+            try:
+                while True:
+                    url = f"{dataset_url}&limit={page_size}&offset={offset}"
+                    data = get_with_retry(session, url, limiter).json()
+                    page = data.pop("records", [])
+                    if meta is None:
+                        meta = data
+                    if not page:
+                        break
+                    records.extend(page)
+                    offset += len(page)
+            except (requests.RequestException, ValueError) as e:
+                print(f"❌ Error recording {dataset_name}: {e}")
+                continue
+
+            # Paging fields are regenerated per response by the stub server
+            for key in ("count", "limit", "offset"):
+                (meta or {}).pop(key, None)
+            with open(cassette_path(cassette_dir, resource_path), "w", encoding="utf-8") as f:
+                json.dump({"dataset": dataset_name, "resource_path": resource_path,
+                           "meta": meta or {}, "records": records}, f)
+            print(f"📼 Recorded {len(records)} records for {dataset_name}")
+    finally:
+        session.close()
+
+
+def load_cassettes(cassette_dir):
+    cassettes = {}
+    for filename in os.listdir(cassette_dir):
+        if filename.endswith(".json"):
+            with open(os.path.join(cassette_dir, filename), encoding="utf-8") as f:
+                cassette = json.load(f)
+            cassettes[cassette["resource_path"]] = cassette
+    return cassettes
+
+
+def make_handler(cassettes, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, inflate=1, max_page_size=None, seed=None):
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+    counters = {"requests": 0, "errors": 0}
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            query = parse_qs(parts.query)
+            cassette = cassettes.get(parts.path)
+            with rng_lock:
+                counters["requests"] += 1
+                delay = max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000
+                fail = rng.random() < error_rate
+                if fail:
+                    counters["errors"] += 1
+                    # Drawn under the lock too, so threaded replay stays deterministic per seed
+                    status = rng.choice([429, 503])
+            time.sleep(delay)
+
+            if cassette is None:
+                return self.send_json(404, {"error": f"No cassette for {parts.path}"})
+            if fail:
+                return self.send_json(status, {"error": "injected failure"}, {"Retry-After": "0"})
+
+            try:
+                offset = int(query.get("offset", ["0"])[0])
+                limit = int(query.get("limit", ["10"])[0])
+            except ValueError:
+                return self.send_json(400, {"error": "offset and limit must be integers"})
+            if max_page_size:
+                limit = min(limit, max_page_size)
+
+            # Inflation repeats the recorded rows back to back
+            base = cassette["records"]
+            total = len(base) * inflate
+            end = min(offset + limit, total)
+            records = [base[i % len(base)] for i in range(offset, end)] if base else []
+            body = dict(cassette["meta"], total=total, count=len(records), limit=limit,
+                        offset=offset, records=records)
+            self.send_json(200, body)
+
+        def send_json(self, status, body, headers=None):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    ReplayHandler.counters = counters
+    return ReplayHandler
+
+
+def start_server(cassettes, host="127.0.0.1", port=0, **options):
+    server = ThreadingHTTPServer((host, port), make_handler(cassettes, **options))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def bench(cassette_dir, workers, page_workers, rate, burst, max_retries, fmt, **server_options):
+    cassettes = load_cassettes(cassette_dir)
+    resources = {c["dataset"]: path for path, c in cassettes.items()}
+    if not resources:
+        raise ValueError(f"No cassettes found in {cassette_dir}. Run `replay.py record` first.")
+
+    server = start_server(cassettes, **server_options)
+    base_url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    try:
+        with tempfile.TemporaryDirectory() as bronze_dir:
+            results = run_ingestion(resources, api_key="replay", base_url=base_url, workers=workers, rate=rate,
+                                    burst=burst, max_retries=max_retries, page_workers=page_workers, fmt=fmt,
+                                    manifest_path=os.path.join(bronze_dir, "_manifest.json"),
+                                    full_refresh=True, bronze_dir=bronze_dir)
+    finally:
+        server.shutdown()
+    counters = server.RequestHandlerClass.counters
+    print(f"🧪 Stub served {counters['requests']} requests ({counters['errors']} injected errors)")
+    return results
+
+
+def add_server_options(parser):
+    parser.add_argument("--cassettes", default=CASSETTE_DIR, help="Directory holding recorded cassettes")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses turned into 429/503")
+    parser.add_argument("--inflate", type=int, default=1, help="Serve each dataset this many times over")
+    parser.add_argument("--server-max-page-size", type=int, default=None, help="Server-side cap on `limit`")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency jitter and error injection")
+
+
+def server_options(args):
+    return {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate,
+            "inflate": args.inflate, "max_page_size": args.server_max_page_size, "seed": args.seed}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Record/replay stand-in for the data.gov.in ingestion path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Capture live API responses into cassettes")
+    record_parser.add_argument("--cassettes", default=CASSETTE_DIR)
+    record_parser.add_argument("--base-url", default=BASE_URL)
+    record_parser.add_argument("--page-size", type=int, default=1000)
+    record_parser.add_argument("datasets", nargs="*", help="Subset of dataset names (default: all)")
+
+    serve_parser = commands.add_parser("serve", help="Serve cassettes over HTTP")
+    add_server_options(serve_parser)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+
+    bench_parser = commands.add_parser("bench", help="Run the ingestion against an in-process stub")
+    add_server_options(bench_parser)
+    bench_parser.add_argument("--workers", type=int, default=4)
+    bench_parser.add_argument("--page-workers", type=int, default=4)
+    bench_parser.add_argument("--rate", type=float, default=50.0)
+    bench_parser.add_argument("--burst", type=int, default=10)
+    bench_parser.add_argument("--max-retries", type=int, default=5)
+    bench_parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.command == "record":
+        if not API_KEY:
+            raise ValueError("Missing API_KEY. Please set it in your .env file.")
+        resources = {name: path for name, path in resources_files.items() if not args.datasets or name in args.datasets}
+        record(resources, API_KEY, args.cassettes, args.base_url, args.page_size)
+    elif args.command == "serve":
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(load_cassettes(args.cassettes),
+                                                                          **server_options(args)))
+        print(f"🧪 Replaying {args.cassettes} on http://{args.host}:{args.port} "
+              f"(run fetch_data.py --base-url http://{args.host}:{args.port})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    else:
+        bench(args.cassettes, args.workers, args.page_workers, args.rate, args.burst, args.max_retries,
+              args.format, **server_options(args))
+
+
+if __name__ == "__main__":
+    main()
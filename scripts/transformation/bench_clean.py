@@ -0,0 +1,115 @@
+import argparse
+import glob
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from cleaning import transform_dataframe
+
+# Benchmarks the vectorized cleaning engine against the original per-cell
+# implementation on a synthetic table and checks both produce the same frame.
+#   python scripts/transformation/bench_clean.py --rows 1000000
+#   python scripts/transformation/bench_clean.py --axis row --rows 20000
+#   python scripts/transformation/bench_clean.py --parity   (every bronze CSV, both axes)
+
+
+def legacy_transform_dataframe(df, fill_median_axis='column'):
+    # The implementation clean_data.py used before cleaning.py, kept as the reference
+    df = df.applymap(lambda x: str(x).strip() if pd.notnull(x) else x)
+    df.replace(["NA", "na", "Na", "N/A", "null", "Null", "none", "None", ""], np.nan, inplace=True)
+    df.dropna(axis=1, how='all', inplace=True)
+
+    for col in df.columns:
+        df[col] = pd.to_numeric(df[col], errors='ignore')
+
+    if fill_median_axis == 'column':
+        for col in df.select_dtypes(include=[np.number]).columns:
+            if df[col].isnull().any():
+                df[col].fillna(df[col].median(), inplace=True)
+    elif fill_median_axis == 'row':
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        for index, row in df[numeric_cols].iterrows():
+            row_median = row.median(skipna=True)
+            df.loc[index, numeric_cols] = row.fillna(row_median)
+    else:
+        raise ValueError("fill_median_axis must be either 'row' or 'column'")
+
+    return df
+
+
+def make_synthetic(rows, seed=0):
+    # Mimics the bronze tables: year/int/float columns with gaps, numbers stored as
+    # padded text with null tokens, low-cardinality labels and an all-null column
+    rng = np.random.default_rng(seed)
+    floats = rng.normal(1000, 250, rows).round(2)
+    floats[rng.random(rows) < 0.05] = np.nan
+    numeric_text = np.char.add(" ", rng.integers(0, 10_000, rows).astype(str)).astype(object)
+    numeric_text[rng.random(rows) < 0.05] = "NA"
+    states = np.array(["Andhra Pradesh ", " Assam", "Bihar", "Goa", "Kerala", "N/A", "Punjab"], dtype=object)
+    return pd.DataFrame({
+        "year": rng.integers(1981, 2024, rows),
+        "count": rng.integers(0, 1_000_000, rows),
+        "amount": floats,
+        "amount_text": numeric_text,
+        "state": states[rng.integers(0, len(states), rows)],
+        "remarks": np.full(rows, np.nan, dtype=object),
+    })
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def check_bronze_parity(root_dir="data/bronze"):
+    failures = 0
+    for path in sorted(glob.glob(os.path.join(root_dir, "**", "*.csv"), recursive=True)):
+        df = pd.read_csv(path)
+        for axis in ("column", "row"):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", FutureWarning)
+                expected = legacy_transform_dataframe(df.copy(), fill_median_axis=axis)
+            try:
+                pd.testing.assert_frame_equal(transform_dataframe(df.copy(), fill_median_axis=axis), expected)
+            except AssertionError as e:
+                failures += 1
+                print(f"❌ {os.path.basename(path)} ({axis}): {e}")
+    print("✅ All bronze datasets match" if not failures else f"❌ {failures} mismatches")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark legacy vs vectorized transform_dataframe")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--axis", choices=["column", "row"], default="column")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the vectorized engine")
+    parser.add_argument("--parity", action="store_true", help="Compare both engines on every bronze CSV instead")
+    args = parser.parse_args()
+
+    if args.parity:
+        raise SystemExit(1 if check_bronze_parity() else 0)
+
+    df = make_synthetic(args.rows)
+    print(f"🧪 Synthetic table: {df.shape[0]:,} rows × {df.shape[1]} columns, fill_median_axis='{args.axis}'")
+
+    fast, fast_seconds = timed(transform_dataframe, df.copy(), fill_median_axis=args.axis)
+    print(f"⚡ vectorized: {fast_seconds:.2f}s")
+    if args.skip_legacy:
+        return
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        legacy, legacy_seconds = timed(legacy_transform_dataframe, df.copy(), fill_median_axis=args.axis)
+    print(f"🐢 legacy:     {legacy_seconds:.2f}s")
+    print(f"🚀 speedup:    {legacy_seconds / fast_seconds:.1f}x")
+
+    pd.testing.assert_frame_equal(fast, legacy, check_exact=False, rtol=1e-12)
+    print("✅ Outputs match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import shutil
+import sys
+import time
+
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from config.gold_specs import GOLD_DIR, GOLD_SPECS, aggregates, build_aggregate, silver_version
+from config.schema_registry import logical_name
+
+# Materializes the gold KPI aggregates defined in config/gold_specs.py from silver:
+#   data/gold/<dataset>/<aggregate>.parquet   e.g. data/gold/eco_sensitive_zones_2015/by_state.parquet
+# Each file is tagged with the silver version it was built from, so the dashboards can
+# tell when it is stale. Datasets missing from silver are skipped.
+#   python scripts/transformation/build_gold.py --silver data/silver --output data/gold
+
+
+def read_columns(folder_path, columns):
+    # Partition columns come back from the Hive paths like any other column
+    files = sorted(os.path.join(dirpath, f) for dirpath, _, filenames in os.walk(folder_path)
+                   for f in filenames if f.endswith(".parquet"))
+    dataset = ds.dataset(files, format="parquet", partitioning="hive", partition_base_dir=folder_path)
+    return dataset.to_table(columns=columns).to_pandas()
+
+
+def build_gold(silver_folder="data/silver", gold_folder=GOLD_DIR):
+    folders = {logical_name(folder_name): os.path.join(silver_folder, folder_name)
+               for folder_name in sorted(os.listdir(silver_folder))
+               if not folder_name.startswith(("_", ".")) and os.path.isdir(os.path.join(silver_folder, folder_name))}
+    built = {}
+    for dataset, spec in GOLD_SPECS.items():
+        folder_path = folders.get(dataset)
+        if folder_path is None:
+            print(f"⏭️ {dataset}: not in {silver_folder}, skipped")
+            continue
+        version = silver_version(folder_path)
+        staging = os.path.join(gold_folder, f"_{dataset}")
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        for name, (keys, cumulative) in aggregates(dataset).items():
+            df = read_columns(folder_path, keys + spec["measures"])
+            table = build_aggregate(df, keys, spec["measures"], cumulative, version)
+            pq.write_table(table, os.path.join(staging, name + ".parquet"))
+            built.setdefault(dataset, []).append(name)
+
+        output = os.path.join(gold_folder, dataset)
+        shutil.rmtree(output, ignore_errors=True)
+        os.replace(staging, output)
+    return built
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build gold KPI aggregates from silver")
+    parser.add_argument("--silver", default="data/silver", help="Silver directory")
+    parser.add_argument("--output", default=GOLD_DIR, help="Gold directory")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    built = build_gold(args.silver, args.output)
+    for dataset, names in built.items():
+        print(f"✅ {dataset}: {', '.join(names)}")
+    print(f"⏱️ Built {sum(len(names) for names in built.values())} aggregates in {time.perf_counter() - started:.2f}s")
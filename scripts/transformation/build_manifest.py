@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+import time
+
+# Tracks, per silver output folder, what it was built from: the bronze file's content
+# hash, the transform parameters and the version of the cleaning code. An output is up
+# to date when all three match and the file still exists, so reruns only rebuild what
+# actually changed.
+MANIFEST_NAME = "_build_manifest.json"
+
+# Any change to these files changes the code version and invalidates every output
+# (paths are relative to this directory; the schema contracts count as code)
+CODE_FILES = ["clean_data.py", "cleaning.py", "silver_writer.py", "streaming_clean.py", "sketch.py", "column_profile.py",
+              "../../config/schema_registry.py", "../../table_schemas.json"]
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_version():
+    here = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for filename in CODE_FILES:
+        with open(os.path.join(here, filename), "rb") as f:
+            digest.update(filename.encode() + b"\0" + f.read())
+    return digest.hexdigest()[:16]
+
+
+def load_manifest(output_base_folder):
+    path = os.path.join(output_base_folder, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(output_base_folder, manifest):
+    path = os.path.join(output_base_folder, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_up_to_date(entry, bronze_hash, params, version, output_path):
+    return (
+        entry is not None
+        and entry.get("bronze_hash") == bronze_hash
+        and entry.get("params") == params
+        and entry.get("code_version") == version
+        and os.path.exists(output_path)
+    )
+
+
+def make_entry(name, bronze_path, bronze_hash, params, version, output_path, rows):
+    return {
+        "dataset": name,
+        "bronze_path": bronze_path,
+        "bronze_hash": bronze_hash,
+        "params": params,
+        "code_version": version,
+        "output": output_path,
+        "rows": rows,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
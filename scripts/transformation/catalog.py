@@ -0,0 +1,131 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import pyarrow.parquet as pq
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from config.schema_registry import logical_name
+
+# Writes data/silver/_catalog.json: for every silver dataset, its logical name (the
+# folder name without the hash suffix), folder, files, row count, byte size, schema,
+# partition columns and per-column min/max/null counts. Everything comes from Parquet
+# footers, no data pages are read, so readers can list, size and resolve datasets
+# without touching the files themselves.
+#   python scripts/transformation/catalog.py --output data/silver
+
+CATALOG_NAME = "_catalog.json"
+
+
+def jsonable(value):
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def merge_stat(column, key, value, pick):
+    if value is None:
+        return
+    column[key] = value if column.get(key) is None else pick(column[key], value)
+
+
+def describe_dataset(base_folder, folder_name):
+    folder_path = os.path.join(base_folder, folder_name)
+    files = []
+    columns = {}
+    partition_columns = []
+    for dirpath, dirnames, filenames in os.walk(folder_path):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if not filename.endswith(".parquet"):
+                continue
+            path = os.path.join(dirpath, filename)
+            metadata = pq.read_metadata(path)
+            relative = os.path.relpath(path, folder_path)
+            files.append({"path": relative, "rows": metadata.num_rows, "bytes": os.path.getsize(path),
+                          "row_groups": metadata.num_row_groups})
+
+            # Hive partition values live in the path, not in the file
+            for part in os.path.dirname(relative).split(os.sep):
+                if "=" in part:
+                    name, value = part.split("=", 1)
+                    if name not in partition_columns:
+                        partition_columns.append(name)
+                    column = columns.setdefault(name, {"name": name, "type": "partition", "null_count": 0})
+                    merge_stat(column, "min", value, min)
+                    merge_stat(column, "max", value, max)
+
+            schema = metadata.schema.to_arrow_schema()
+            for field in schema:
+                columns.setdefault(field.name, {"name": field.name, "type": str(field.type), "null_count": 0})
+            for rg in range(metadata.num_row_groups):
+                row_group = metadata.row_group(rg)
+                for i in range(row_group.num_columns):
+                    chunk = row_group.column(i)
+                    name = chunk.path_in_schema
+                    stats = chunk.statistics
+                    if name not in columns or stats is None:
+                        continue
+                    column = columns[name]
+                    if stats.has_null_count and column.get("null_count") is not None:
+                        column["null_count"] += stats.null_count
+                    if stats.has_min_max:
+                        merge_stat(column, "min", jsonable(stats.min), min)
+                        merge_stat(column, "max", jsonable(stats.max), max)
+
+    return {
+        "name": logical_name(folder_name),
+        "folder": folder_name,
+        "rows": sum(f["rows"] for f in files),
+        "bytes": sum(f["bytes"] for f in files),
+        "files": files,
+        "partition_columns": partition_columns,
+        "columns": list(columns.values()),
+    }
+
+
+def build_catalog(base_folder="data/silver"):
+    datasets = {}
+    collisions = set()
+    for folder_name in sorted(os.listdir(base_folder)):
+        if folder_name.startswith(("_", ".")) or not os.path.isdir(os.path.join(base_folder, folder_name)):
+            continue
+        entry = describe_dataset(base_folder, folder_name)
+        if not entry["files"]:
+            continue
+        name = entry["name"]
+        if name in datasets or name in collisions:
+            # Folders whose truncated names differ only in the hash: each is catalogued under
+            # its folder name, so neither silently replaces the other
+            print(f"⚠️ {folder_name} shares the logical name {name!r} with another dataset; "
+                  f"catalogued under its folder name")
+            if name in datasets:
+                other = datasets.pop(name)
+                other["name"] = other["folder"]
+                datasets[other["folder"]] = other
+            collisions.add(name)
+            name = entry["name"] = folder_name
+        datasets[name] = entry
+    catalog = {"built_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "datasets": datasets}
+
+    path = os.path.join(base_folder, CATALOG_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+    return catalog
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the silver dataset catalog from Parquet metadata")
+    parser.add_argument("--output", default="data/silver", help="Silver directory")
+    args = parser.parse_args()
+    catalog = build_catalog(args.output)
+    print(f"✅ Catalogued {len(catalog['datasets'])} datasets in {os.path.join(args.output, CATALOG_NAME)}")
@@ -1,69 +1,243 @@
 import os
+import sys
+import time
+import argparse
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
-import numpy as np
-import hashlib
+
+from build_gold import build_gold
+from catalog import build_catalog
+from column_profile import write_profile
+from build_manifest import code_version, file_sha256, is_up_to_date, load_manifest, make_entry, save_manifest
+from cleaning import NULL_TOKENS, transform_dataframe
+from silver_writer import replace_folder, write_silver, write_silver_partitioned
+from streaming_clean import stream_transform
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from config.gold_specs import GOLD_DIR
+from config.schema_registry import SchemaDriftError, get_registry, silver_folder_name
 
 root_dir = 'data/bronze'
-dfs_dict = {}
+output_base_folder = "data/silver"
 
-# Step 1: Read all CSVs under the bronze directory
-for dirpath, dirnames, filenames in os.walk(root_dir):
-    for filename in filenames:
-        if filename.lower().endswith(".csv"):
-            full_path = os.path.join(dirpath, filename)
-            try:
-                df = pd.read_csv(full_path)
+# Bronze files bigger than this are cleaned out-of-core in chunks (see streaming_clean.py)
+STREAM_THRESHOLD_MB = 512
+CHUNKSIZE = 100_000
+
+# Outputs are written here first and swapped into place once complete
+STAGING_DIR = "_staging"
+
+# Datasets filled with each row's median instead of each column's. Only for tables whose
+# numeric columns all hold one measure: the Himalaya heritage table mixes organization
+# counts with Rs-lakh amounts in every row, so it keeps the column-wise fill.
+row_wise_normailze = []
 
+
+# Step 1: Find all CSVs (or Parquet files written by fetch_data.py --format parquet) under the bronze directory
+def find_bronze_files(root_dir):
+    bronze_files = {}
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        for filename in filenames:
+            if filename.lower().endswith((".csv", ".parquet")):
                 file_stem = os.path.splitext(filename)[0]
-                dfs_dict[file_stem] = df
+                bronze_files[file_stem] = os.path.join(dirpath, filename)
+    return bronze_files
 
-            except Exception as e:
-                print(f"Error processing {full_path}: {e}")
 
-# Step 2: Clean and transform data
-row_wise_normailze = []
+def read_bronze(full_path, contract=None):
+    if full_path.lower().endswith(".parquet"):
+        return pd.read_parquet(full_path)
+    if contract is None:
+        return pd.read_csv(full_path)
+    # Registered tables are parsed straight into their contract types. Values the parser
+    # cannot take as-is (e.g. padded null tokens) fall back to a text read, which
+    # transform_dataframe then casts, or rejects, column by column.
+    try:
+        return pd.read_csv(full_path, dtype=contract.read_dtypes(), na_values=NULL_TOKENS)
+    except (ValueError, TypeError):
+        return pd.read_csv(full_path, dtype=str)
+
+
+def reset_peak_rss():
+    # Linux lets a process reset its high-water mark, which makes the peak per task
+    # even though pool workers are reused; elsewhere we report the worker's lifetime peak
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def as_drift(contract, error):
+    # A registered table whose data no longer parses into its contract has drifted
+    if contract is None or isinstance(error, SchemaDriftError):
+        return error
+    return SchemaDriftError(f"{contract.table_name}: {error}")
+
+
+# Step 2 + 3: Clean one dataset and save it as Parquet under data/silver/ (runs in a worker process).
+# With `partition_by`, datasets having any of those columns are written as Hive partitions
+# (<folder>/year=2019/part-0.parquet); the others stay a single file.
+def clean_dataset(name, full_path, output_base_folder, stream_threshold_mb=STREAM_THRESHOLD_MB, chunksize=CHUNKSIZE,
+                  manifest_entry=None, version=None, force=False, partition_by=None):
+    reset_peak_rss()
+    started = time.perf_counter()
+    stats = {"dataset": name, "rows": 0, "seconds": 0.0, "peak_rss_mb": None, "output": None, "error": None,
+             "mode": "in-memory", "skipped": False, "manifest_entry": None, "types": "inferred"}
+    try:
+        streaming = os.path.getsize(full_path) >= stream_threshold_mb * 1024 * 1024
+        stats["mode"] = "streaming" if streaming else "in-memory"
+        params = {
+            "fill_median_axis": 'row' if name in row_wise_normailze else 'column',
+            "mode": stats["mode"],
+        }
+        if partition_by:
+            params["partition_by"] = list(partition_by)
+        folder_name = silver_folder_name(name)
+        output_folder = os.path.join(output_base_folder, folder_name)
+        output_path = output_folder if partition_by else os.path.join(output_folder, f"{folder_name}.parquet")
+
+        bronze_hash = file_sha256(full_path)
+        if not force and is_up_to_date(manifest_entry, bronze_hash, params, version, output_path):
+            stats["skipped"] = True
+            stats["rows"] = manifest_entry.get("rows", 0)
+            stats["output"] = output_path
+            stats["seconds"] = time.perf_counter() - started
+            return stats
+
+        fill_median_axis = params["fill_median_axis"]
+        contract = get_registry().for_dataset(name)
+        column_kinds = contract.families if contract is not None else None
+        stats["types"] = "registry" if contract is not None else "inferred"
+        staging_folder = os.path.join(output_base_folder, STAGING_DIR, folder_name)
+        shutil.rmtree(staging_folder, ignore_errors=True)
+        os.makedirs(staging_folder)
+        staging_file = os.path.join(staging_folder, f"{folder_name}.parquet")
+        if streaming:
+            try:
+                stats["rows"] = stream_transform(full_path, staging_file, fill_median_axis=fill_median_axis,
+                                                 chunksize=chunksize, partition_cols=partition_by, contract=contract)
+            except (ValueError, TypeError) as e:
+                raise as_drift(contract, e)
+        else:
+            df = read_bronze(full_path, contract)
+            try:
+                df = transform_dataframe(df, fill_median_axis=fill_median_axis, column_kinds=column_kinds)
+            except (ValueError, TypeError) as e:
+                raise as_drift(contract, e)
+            partition_cols = [col for col in partition_by or [] if col in df.columns]
+            if partition_cols:
+                stats["rows"] = write_silver_partitioned(df, staging_folder, partition_cols, contract=contract)
+            else:
+                stats["rows"] = write_silver(df, staging_file, contract=contract)
+        write_profile(staging_folder)
+        replace_folder(staging_folder, output_folder)
+        stats["output"] = output_path
+        stats["manifest_entry"] = make_entry(name, full_path, bronze_hash, params, version, output_path, stats["rows"])
+    except Exception as e:
+        stats["error"] = f"{type(e).__name__}: {e}"
+    stats["seconds"] = time.perf_counter() - started
+    stats["peak_rss_mb"] = peak_rss_mb()
+    return stats
+
+
+def print_summary(results, total_seconds):
+    print("\n📊 Clean stage summary")
+    for stats in sorted(results, key=lambda s: s["dataset"]):
+        rss = f"{stats['peak_rss_mb']:.0f} MB" if stats["peak_rss_mb"] is not None else "n/a"
+        if stats["error"]:
+            print(f"❌ {stats['dataset']}: {stats['error']} ({stats['seconds']:.2f}s, peak RSS {rss})")
+        elif stats["skipped"]:
+            print(f"⏭️ {stats['dataset']}: up to date ({stats['rows']} rows)")
+        else:
+            print(f"✅ {stats['dataset']}: {stats['rows']} rows in {stats['seconds']:.2f}s "
+                  f"({stats['mode']}, {stats['types']} types, peak RSS {rss})")
+    print(f"⏱️ Total wall time: {total_seconds:.2f}s")
+
+
+def run_clean(root_dir=root_dir, output_base_folder=output_base_folder, workers=None,
+              stream_threshold_mb=STREAM_THRESHOLD_MB, chunksize=CHUNKSIZE, force=False, partition_by=None,
+              gold_folder=GOLD_DIR):
+    os.makedirs(output_base_folder, exist_ok=True)
+    bronze_files = find_bronze_files(root_dir)
+    manifest = load_manifest(output_base_folder)
+    version = code_version()
+    started = time.perf_counter()
+    results = []
+
+    # Each dataset is read, transformed and written inside its own task; the parent only
+    # ever holds paths and per-task stats, and a failing file does not stop the others.
+    # Tasks whose bronze hash, parameters and code version match the build manifest
+    # return immediately unless `force` is set.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(clean_dataset, name, full_path, output_base_folder, stream_threshold_mb, chunksize,
+                        manifest.get(silver_folder_name(name)), version, force, partition_by): name
+            for name, full_path in bronze_files.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                stats = future.result()
+            except Exception as e:  # the worker itself died (e.g. killed for memory)
+                stats = {"dataset": name, "rows": 0, "seconds": 0.0, "peak_rss_mb": None, "output": None,
+                         "error": f"{type(e).__name__}: {e}", "mode": None, "skipped": False, "manifest_entry": None,
+                         "types": None}
+            if stats["error"]:
+                print(f"Error processing {bronze_files[name]}: {stats['error']}")
+            elif not stats["skipped"]:
+                manifest[silver_folder_name(name)] = stats["manifest_entry"]
+                save_manifest(output_base_folder, manifest)
+                print(f"✅ Saved dataframe '{name}' to '{stats['output']}'")
+            results.append(stats)
+    shutil.rmtree(os.path.join(output_base_folder, STAGING_DIR), ignore_errors=True)
+    catalog = build_catalog(output_base_folder)
+    print(f"📚 Catalogued {len(catalog['datasets'])} datasets")
+    if gold_folder:
+        built = build_gold(output_base_folder, gold_folder)
+        print(f"🥇 Built gold aggregates for {len(built)} datasets in {gold_folder}")
+
+    print_summary(results, time.perf_counter() - started)
+    return results
 
-def transform_dataframe(df, fill_median_axis='column'):
-    df = df.applymap(lambda x: str(x).strip() if pd.notnull(x) else x)
-    df.replace(["NA", "na", "Na", "N/A", "null", "Null", "none", "None", ""], np.nan, inplace=True)
-    df.dropna(axis=1, how='all', inplace=True)
-
-    for col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors='ignore')
-
-    if fill_median_axis == 'column':
-        for col in df.select_dtypes(include=[np.number]).columns:
-            if df[col].isnull().any():
-                df[col].fillna(df[col].median(), inplace=True)
-    elif fill_median_axis == 'row':
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        for index, row in df[numeric_cols].iterrows():
-            row_median = row.median(skipna=True)
-            df.loc[index, numeric_cols] = row.fillna(row_median)
-    else:
-        raise ValueError("fill_median_axis must be either 'row' or 'column'")
-
-    return df    
-
-df_dict_transformed = {}
-for name, df in dfs_dict.items():
-    if name in row_wise_normailze:
-        df_dict_transformed[name] = transform_dataframe(df.copy(), fill_median_axis='row')
-    else:
-        df_dict_transformed[name] = transform_dataframe(df.copy(), fill_median_axis='column')
-
-# Step 3: Save cleaned data as Parquet under data/silver/
-output_base_folder = "data/silver"
-os.makedirs(output_base_folder, exist_ok=True)
 
-for name, df in df_dict_transformed.items():
-    clean_name = name.lower().replace("-", "_").replace(" ", "_")
-    short_hash = hashlib.md5(clean_name.encode()).hexdigest()[:8]
-    folder_name = clean_name[:80] + "_" + short_hash
+def parse_args():
+    parser = argparse.ArgumentParser(description="Clean bronze datasets into silver Parquet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Datasets cleaned in parallel")
+    parser.add_argument("--root", default=root_dir, help="Bronze directory")
+    parser.add_argument("--output", default=output_base_folder, help="Silver directory")
+    parser.add_argument("--stream-threshold-mb", type=float, default=STREAM_THRESHOLD_MB,
+                        help="Clean bronze files at least this large out-of-core (0 streams everything)")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE, help="Rows per chunk in streaming mode")
+    parser.add_argument("--force", action="store_true", help="Rebuild every dataset even if it is up to date")
+    parser.add_argument("--partition-by", type=lambda value: [col for col in value.split(",") if col],
+                        help="Comma-separated columns to Hive-partition silver by, e.g. year or year,state")
+    parser.add_argument("--gold", default=GOLD_DIR, help="Gold directory (empty to skip the gold build)")
+    return parser.parse_args()
 
-    output_folder = os.path.join(output_base_folder, folder_name)
-    os.makedirs(output_folder, exist_ok=True)
 
-    file_path = os.path.join(output_folder, f"{folder_name}.parquet")
-    df.to_parquet(file_path, index=False)
-    print(f"✅ Saved dataframe '{name}' to '{file_path}'")
+if __name__ == "__main__":
+    args = parse_args()
+    run_clean(args.root, args.output, args.workers, args.stream_threshold_mb, args.chunksize, args.force,
+              args.partition_by, args.gold)
@@ -0,0 +1,111 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (infer_dtype, is_bool_dtype, is_float_dtype, is_numeric_dtype, is_object_dtype,
+                              is_string_dtype)
+
+NULL_TOKENS = ["NA", "na", "Na", "N/A", "null", "Null", "none", "None", ""]
+
+
+def strip_text(s):
+    # Same result as str(x).strip() on every non-null cell, done one column at a time
+    if (is_object_dtype(s) or is_string_dtype(s)) and infer_dtype(s, skipna=True) in ("string", "empty"):
+        return s.str.strip()
+    return s.map(str, na_action="ignore").str.strip()
+
+
+def clean_text_column(s):
+    s = strip_text(s)
+    return s.mask(s.isin(NULL_TOKENS))
+
+
+def to_numeric_or_keep(s):
+    # pd.to_numeric(errors='ignore') without the deprecated flag: all-or-nothing per column
+    try:
+        return pd.to_numeric(s)
+    except (ValueError, TypeError):
+        return s
+
+
+def is_plain_numeric(s):
+    # int/float columns survive the str() -> strip -> to_numeric round trip unchanged,
+    # so they can skip the text pass entirely (bools do not: they become "True"/"False")
+    return is_numeric_dtype(s) and not is_bool_dtype(s)
+
+
+def fill_column_medians(df):
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    with_nulls = [col for col in numeric_cols if df[col].isnull().any()]
+    if with_nulls:
+        df[with_nulls] = df[with_nulls].fillna(df[with_nulls].median())
+    return df
+
+
+def fill_row_medians(df):
+    # Each row's NaNs take that row's median over the numeric columns: one nanmedian
+    # over the numeric block, then a masked fill of the columns that have gaps
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    with_nulls = [col for col in numeric_cols if df[col].isnull().any()]
+    if not with_nulls:
+        return df
+
+    block = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    with warnings.catch_warnings():
+        # Rows with no numeric values at all stay NaN, as before
+        warnings.simplefilter("ignore", RuntimeWarning)
+        row_medians = np.nanmedian(block, axis=1)
+
+    for col in with_nulls:
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        df[col] = np.where(np.isnan(values), row_medians, values)
+    return df
+
+
+def narrow_int_columns(df, column_kinds):
+    # Columns declared "int" are read as float64 so a median fill cannot fail; once filled,
+    # whole-valued ones go back to int64. A fractional fill stays float and is rejected by
+    # the contract when written, as in the streaming path.
+    for col, kind in column_kinds.items():
+        if kind != "int" or col not in df.columns or not is_float_dtype(df[col]):
+            continue
+        values = df[col].to_numpy()
+        if not np.isnan(values).any() and np.array_equal(values, np.floor(values)):
+            df[col] = values.astype(np.int64)
+    return df
+
+
+def transform_dataframe(df, fill_median_axis='column', column_kinds=None):
+    if fill_median_axis not in ('column', 'row'):
+        raise ValueError("fill_median_axis must be either 'row' or 'column'")
+
+    # Strip text, map null tokens, drop all-null columns, then try a numeric cast,
+    # column by column (replaces the per-cell applymap pass). Columns named in
+    # `column_kinds` ("int"/"float"/"text", from the schema registry) skip the trial
+    # cast: text stays text and numeric columns must parse or ValueError is raised.
+    column_kinds = column_kinds or {}
+    cleaned = []
+    for i in range(df.shape[1]):
+        s = df.iloc[:, i]
+        if not is_plain_numeric(s):
+            s = clean_text_column(s)
+        if s.isna().all():
+            continue
+        kind = column_kinds.get(df.columns[i])
+        if kind == "text" or is_plain_numeric(s):
+            cleaned.append(s)
+        elif kind in ("int", "float"):
+            try:
+                cleaned.append(pd.to_numeric(s))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"column {df.columns[i]!r} is declared {kind} but holds non-numeric values: {e}")
+        else:
+            cleaned.append(to_numeric_or_keep(s))
+
+    df = pd.concat(cleaned, axis=1) if cleaned else pd.DataFrame(index=df.index)
+
+    if fill_median_axis == 'column':
+        df = fill_column_medians(df)
+    else:
+        df = fill_row_medians(df)
+    return narrow_int_columns(df, column_kinds)
@@ -0,0 +1,184 @@
+import argparse
+import json
+import math
+import os
+from collections import Counter
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from catalog import jsonable
+from sketch import QuantileSketch
+
+# Writes <silver folder>/_profile.json next to each dataset's Parquet files: per-column
+# type, null count, min/max, mean/std, approximate quantiles, distinct count and top-K
+# values, plus the largest per-category totals of every numeric column (for category
+# columns with at most GROUP_KEY_CAP values). It is computed in one pass over record
+# batches, so memory stays bounded for large datasets, and the explorer's stats sections
+# read it instead of recomputing over the full frame.
+#   python scripts/transformation/column_profile.py --output data/silver   (backfill)
+
+PROFILE_NAME = "_profile.json"
+QUANTILES = [0.25, 0.5, 0.75]
+TOP_K = 10
+GROUP_TOP_K = 20
+# Distinct values are tracked exactly up to this many per column, then only counted as a floor
+DISTINCT_CAP = 100_000
+# Per-category totals are kept for at most this many categories per column; past that the
+# column's totals are dropped (and listed as truncated) rather than growing with the data
+GROUP_KEY_CAP = 10_000
+BATCH_ROWS = 65_536
+
+
+def column_kind(pa_type):
+    if pa.types.is_dictionary(pa_type):
+        pa_type = pa_type.value_type
+    if pa.types.is_integer(pa_type) or pa.types.is_floating(pa_type):
+        return "numeric"
+    if pa.types.is_string(pa_type) or pa.types.is_large_string(pa_type):
+        return "category"
+    return "other"
+
+
+def plain(array):
+    return array.dictionary_decode() if pa.types.is_dictionary(array.type) else array
+
+
+class ColumnProfile:
+    def __init__(self, field):
+        self.name = field.name
+        self.type = str(field.type.value_type if pa.types.is_dictionary(field.type) else field.type)
+        self.kind = column_kind(field.type)
+        self.count = 0
+        self.null_count = 0
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sketch = QuantileSketch() if self.kind == "numeric" else None
+        self.values = Counter()
+        self.distinct_exact = True
+
+    def update(self, array):
+        array = plain(array)
+        self.null_count += array.null_count
+        self.count += len(array) - array.null_count
+        if len(array) == array.null_count:
+            return
+        if self.kind in ("numeric", "category"):
+            bounds = pc.min_max(array)
+            low, high = bounds["min"].as_py(), bounds["max"].as_py()
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        if self.kind == "numeric":
+            values = array.to_numpy(zero_copy_only=False).astype(np.float64)
+            values = values[~np.isnan(values)]
+            # A batch of only NaN (not null) values has no moments to merge
+            if values.size:
+                # Chan et al. merge of per-batch mean and sum of squared deviations
+                seen = self.sketch.count
+                batch_mean = float(values.mean())
+                delta = batch_mean - self.mean
+                self.mean += delta * values.size / (seen + values.size)
+                self.m2 += float(np.square(values - batch_mean).sum()) \
+                    + delta * delta * seen * values.size / (seen + values.size)
+                self.sketch.update(values)
+        counts = pc.value_counts(array.drop_null())
+        for value, n in zip(counts.field("values").to_pylist(), counts.field("counts").to_pylist()):
+            if value in self.values or len(self.values) < DISTINCT_CAP:
+                self.values[value] += n
+            else:
+                self.distinct_exact = False
+
+    def to_dict(self):
+        result = {
+            "name": self.name,
+            "type": self.type,
+            "kind": self.kind,
+            "count": self.count,
+            "null_count": self.null_count,
+            "min": jsonable(self.min),
+            "max": jsonable(self.max),
+            "distinct": len(self.values),
+            "distinct_exact": self.distinct_exact,
+            "top": [[jsonable(value), n] for value, n in self.values.most_common(TOP_K)],
+        }
+        # Moments cover the non-NaN values merged so far, which is what pandas counts
+        merged = self.sketch.count if self.sketch is not None else 0
+        if self.kind == "numeric" and merged:
+            # Sample standard deviation, like pandas
+            result["mean"] = jsonable(self.mean)
+            result["std"] = jsonable(math.sqrt(self.m2 / (merged - 1)) if merged > 1 else math.nan)
+            result["quantiles"] = {str(q): jsonable(self.sketch.quantile(q)) for q in QUANTILES}
+        return result
+
+
+def profile_dataset(folder_path):
+    # Partition columns come back from the Hive paths like any other column
+    files = sorted(os.path.join(dirpath, f) for dirpath, _, filenames in os.walk(folder_path)
+                   for f in filenames if f.endswith(".parquet"))
+    dataset = ds.dataset(files, format="parquet", partitioning="hive", partition_base_dir=folder_path)
+    columns = {field.name: ColumnProfile(field) for field in dataset.schema}
+    numeric = [name for name, column in columns.items() if column.kind == "numeric"]
+    categories = [name for name, column in columns.items() if column.kind == "category"]
+    grouped = {cat: {num: Counter() for num in numeric} for cat in categories}
+    truncated = set()
+    rows = 0
+
+    for batch in dataset.to_batches(batch_size=BATCH_ROWS):
+        rows += batch.num_rows
+        for name, column in columns.items():
+            column.update(batch.column(name))
+        if not numeric or not categories:
+            continue
+        table = pa.Table.from_batches([batch])
+        for cat in categories:
+            if cat in truncated:
+                continue
+            by_cat = pa.table({cat: plain(table.column(cat).combine_chunks()),
+                               **{num: table.column(num) for num in numeric}})
+            sums = by_cat.group_by(cat).aggregate([(num, "sum") for num in numeric])
+            keys = sums.column(cat).to_pylist()
+            for num in numeric:
+                for key, total in zip(keys, sums.column(f"{num}_sum").to_pylist()):
+                    if key is not None and total is not None:
+                        grouped[cat][num][key] += total
+            if max(len(totals) for totals in grouped[cat].values()) > GROUP_KEY_CAP:
+                truncated.add(cat)
+                del grouped[cat]
+
+    return {
+        "rows": rows,
+        "columns": [column.to_dict() for column in columns.values()],
+        "grouped_totals": {
+            cat: {num: [[key, jsonable(total)] for key, total in totals.most_common(GROUP_TOP_K)]
+                  for num, totals in by_num.items()}
+            for cat, by_num in grouped.items()
+        },
+        # Too many categories to total exactly; readers compute these from the data instead
+        "grouped_totals_truncated": sorted(truncated),
+    }
+
+
+def write_profile(folder_path):
+    profile = profile_dataset(folder_path)
+    path = os.path.join(folder_path, PROFILE_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+    return profile
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write column profiles for every silver dataset")
+    parser.add_argument("--output", default="data/silver", help="Silver directory")
+    args = parser.parse_args()
+    for folder_name in sorted(os.listdir(args.output)):
+        folder_path = os.path.join(args.output, folder_name)
+        if folder_name.startswith(("_", ".")) or not os.path.isdir(folder_path):
+            continue
+        profile = write_profile(folder_path)
+        print(f"✅ {folder_name}: profiled {len(profile['columns'])} columns over {profile['rows']} rows")
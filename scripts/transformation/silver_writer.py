@@ -0,0 +1,115 @@
+import os
+import shutil
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pandas.api.types import infer_dtype, is_bool_dtype, is_float_dtype, is_integer_dtype, is_object_dtype
+
+# Natural sort keys, in priority order; whichever a dataset has are used to order rows
+# so Parquet min/max statistics let readers skip row groups on year/state predicates
+SORT_KEYS = ["year", "_year", "state", "State", "state_ut", "name_of_state_ut", "Zone", "Circle"]
+
+ROW_GROUP_SIZE = 128_000
+COMPRESSION = "zstd"
+
+# Text columns with at most this share of distinct values are stored dictionary-encoded
+DICTIONARY_MAX_RATIO = 0.5
+
+INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def smallest_int_type(min_value, max_value):
+    for int_type in INT_TYPES:
+        info = np.iinfo(int_type)
+        if info.min <= min_value and max_value <= info.max:
+            return int_type
+    return np.int64
+
+
+def float32_is_exact(values):
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(over="ignore"):
+        return np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True)
+
+
+def downcast_numeric(df):
+    # Integers go to the smallest width that holds their range; floats go to float32
+    # only when every value survives the round trip unchanged
+    for col in df.columns:
+        s = df[col]
+        if is_bool_dtype(s) or s.empty:
+            continue
+        if is_integer_dtype(s):
+            df[col] = s.astype(smallest_int_type(s.min(), s.max()))
+        elif is_float_dtype(s) and s.dtype != np.float32 and float32_is_exact(s.to_numpy()):
+            df[col] = s.astype(np.float32)
+    return df
+
+
+def encode_low_cardinality(df, max_ratio=DICTIONARY_MAX_RATIO):
+    # Stored as Arrow dictionary columns; pandas reads them back as categoricals
+    for col in df.columns:
+        s = df[col]
+        if not is_object_dtype(s) or infer_dtype(s, skipna=True) != "string":
+            continue
+        non_null = s.count()
+        if non_null and s.nunique() <= max_ratio * non_null:
+            df[col] = s.astype("category")
+    return df
+
+
+def sort_by_natural_keys(df, keys=SORT_KEYS):
+    present = [key for key in keys if key in df.columns]
+    if not present:
+        return df
+    return df.sort_values(present, kind="stable", na_position="last").reset_index(drop=True)
+
+
+def to_silver_table(df, contract=None):
+    # `contract` (a schema registry TableSchema) pins column order and types
+    df = sort_by_natural_keys(df)
+    df = downcast_numeric(df)
+    df = encode_low_cardinality(df)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    return contract.conform(table) if contract is not None else table
+
+
+def write_silver(df, file_path, row_group_size=ROW_GROUP_SIZE, compression=COMPRESSION, contract=None):
+    table = to_silver_table(df, contract)
+    tmp_path = file_path + ".tmp"
+    pq.write_table(table, tmp_path, row_group_size=row_group_size, compression=compression,
+                   write_statistics=True)
+    os.replace(tmp_path, file_path)
+    return table.num_rows
+
+
+def write_partitions(table, output_folder, partition_cols, basename="part-{i}.parquet",
+                     row_group_size=ROW_GROUP_SIZE, compression=COMPRESSION):
+    # Hive layout: <output_folder>/<col>=<value>/.../<basename>. The partition columns
+    # live only in the directory names, so readers must open the folder as a dataset
+    file_options = ds.ParquetFileFormat().make_write_options(compression=compression, write_statistics=True)
+    ds.write_dataset(table, output_folder, format="parquet", partitioning=partition_cols,
+                     partitioning_flavor="hive", basename_template=basename, file_options=file_options,
+                     max_rows_per_group=row_group_size, existing_data_behavior="overwrite_or_ignore")
+
+
+def write_silver_partitioned(df, output_folder, partition_cols, row_group_size=ROW_GROUP_SIZE,
+                             compression=COMPRESSION, contract=None):
+    table = to_silver_table(df, contract)
+    write_partitions(table, output_folder, partition_cols, row_group_size=row_group_size, compression=compression)
+    return table.num_rows
+
+
+def replace_folder(staging_folder, output_folder):
+    # Swap a freshly written output folder in, so stale files or partitions from an
+    # earlier layout never mix with the new ones
+    old_folder = staging_folder + ".old"
+    if os.path.exists(old_folder):
+        shutil.rmtree(old_folder)
+    if os.path.exists(output_folder):
+        os.replace(output_folder, old_folder)
+    os.replace(staging_folder, output_folder)
+    if os.path.exists(old_folder):
+        shutil.rmtree(old_folder)
@@ -0,0 +1,61 @@
+import numpy as np
+
+
+class QuantileSketch:
+    # Mergeable KLL-style quantile sketch. Level i holds values that each stand for
+    # 2**i inputs; when a level grows past `k` it is sorted and every other value
+    # (random offset) is promoted to the next level. Memory is O(k * log(n / k)) and
+    # results are exact while fewer than `k` values have been seen.
+    def __init__(self, k=8192, seed=None):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self.count += values.size
+            self._compress()
+        return self
+
+    def merge(self, other):
+        for i, level in enumerate(other.levels):
+            if i == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[i] = np.concatenate([self.levels[i], level])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        if self.count == 0:
+            return np.nan
+        if len(self.levels) == 1:
+            return float(np.quantile(self.levels[0], q))
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(level.size, 2 ** i) for i, level in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(values[order][min(index, values.size - 1)])
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def _compress(self):
+        i = 0
+        while i < len(self.levels):
+            level = self.levels[i]
+            if level.size > self.k:
+                level = np.sort(level)
+                leftover = level[-1:] if level.size % 2 else level[:0]
+                pairs = level[:level.size - leftover.size]
+                promoted = pairs[self.rng.integers(2)::2]
+                self.levels[i] = leftover
+                if i + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[i + 1] = np.concatenate([self.levels[i + 1], promoted])
+            i += 1
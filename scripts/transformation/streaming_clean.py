@@ -0,0 +1,175 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cleaning import clean_text_column, fill_row_medians
+from silver_writer import (COMPRESSION, DICTIONARY_MAX_RATIO, ROW_GROUP_SIZE, float32_is_exact, smallest_int_type,
+                           sort_by_natural_keys, write_partitions)
+from sketch import QuantileSketch
+
+# Out-of-core variant of transform_dataframe for bronze files larger than RAM.
+#   sample  the first `sample_rows` rows rule out numeric types for columns holding text
+#   pass 1  chunk by chunk: confirm the remaining numeric candidates, find all-null
+#           columns, pick the narrowest safe int/float width and the text columns to
+#           dictionary-encode (as silver_writer does in memory) and feed column medians
+#           into a QuantileSketch
+#   pass 2  chunk by chunk: clean, cast, fill, sort on silver_writer's natural keys and
+#           append each chunk to the silver Parquet file as row groups under one fixed
+#           Arrow schema
+# Rows are sorted within each chunk only; a global out-of-core sort is out of scope, so
+# row groups of a large file overlap on the sort keys more than in-memory output does.
+# With `partition_cols`, those of them the file has are used to write Hive partitions
+# into the folder of `output_path` instead, each chunk adding one file per partition.
+# Memory is bounded by one chunk plus the sketches and DICTIONARY_TRACK_CAP distinct
+# values per text column. Column medians are exact up to the
+# sketch size and approximate beyond it; row-wise fills are exact.
+
+# Text columns with more distinct values than this are stored plain, without counting further
+DICTIONARY_TRACK_CAP = 100_000
+
+
+def iter_chunks(full_path, chunksize):
+    # Everything is read as text so each chunk sees the same values a whole-file read would
+    if full_path.lower().endswith(".parquet"):
+        for batch in pq.ParquetFile(full_path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas().astype(object)
+    else:
+        yield from pd.read_csv(full_path, dtype=str, chunksize=chunksize)
+
+
+def clean_chunk_text(chunk):
+    return pd.concat([clean_text_column(chunk[col]) for col in chunk.columns], axis=1)
+
+
+def infer_from_sample(full_path, sample_rows):
+    # A column is numeric only if every non-null value parses, so a sample can rule a
+    # column out but never in: survivors are candidates that pass 1 has to confirm
+    first = next(iter_chunks(full_path, sample_rows), None)
+    if first is None:
+        raise ValueError(f"{full_path} has no rows")
+    sample = clean_chunk_text(first)
+    candidates = set()
+    for col in sample.columns:
+        try:
+            pd.to_numeric(sample[col])
+            candidates.add(col)
+        except (ValueError, TypeError):
+            pass
+    return list(sample.columns), candidates
+
+
+def profile_columns(full_path, chunksize, sample_rows, sketch_size, column_kinds=None):
+    # Columns declared in `column_kinds` (schema registry) take their kind from there
+    column_kinds = column_kinds or {}
+    columns, candidates = infer_from_sample(full_path, sample_rows)
+    numeric = {col for col in candidates if col not in column_kinds}
+    numeric |= {col for col in columns if column_kinds.get(col) in ("int", "float")}
+    has_values = {col: False for col in columns}
+    # Distinct values and non-null count of text columns, for the dictionary decision;
+    # a column's set is dropped once it passes DICTIONARY_TRACK_CAP
+    text_values = {col: set() for col in columns if col not in numeric}
+    text_counts = {col: 0 for col in text_values}
+    integral = {col: True for col in numeric}
+    float32_exact = {col: True for col in numeric}
+    bounds = {col: (np.inf, -np.inf) for col in numeric}
+    sketches = {col: QuantileSketch(k=sketch_size) for col in numeric}
+
+    for chunk in iter_chunks(full_path, chunksize):
+        chunk = clean_chunk_text(chunk)
+        for col in columns:
+            s = chunk[col]
+            if s.notna().any():
+                has_values[col] = True
+            if col not in numeric:
+                if text_values.get(col) is not None:
+                    text_values[col].update(s.dropna().unique())
+                    text_counts[col] += int(s.notna().sum())
+                    if len(text_values[col]) > DICTIONARY_TRACK_CAP:
+                        text_values[col] = None
+                continue
+            try:
+                values = pd.to_numeric(s)
+            except (ValueError, TypeError) as e:
+                if col in column_kinds:
+                    raise ValueError(f"column {col!r} is declared {column_kinds[col]} but holds non-numeric values: {e}")
+                numeric.discard(col)
+                sketches.pop(col)
+                # Rows seen before this chunk were numeric, so this column is not tracked
+                text_values[col] = None
+                continue
+            if values.dtype.kind not in "iu" or column_kinds.get(col) == "float":
+                integral[col] = False
+            as_float = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            if values.notna().any():
+                bounds[col] = (min(bounds[col][0], values.min()), max(bounds[col][1], values.max()))
+            if float32_exact[col] and not float32_is_exact(as_float):
+                float32_exact[col] = False
+            sketches[col].update(as_float)
+
+    kept = [col for col in columns if has_values[col]]
+    kinds = {}
+    arrow_types = {}
+    for col in kept:
+        if col not in numeric:
+            kinds[col] = "text"
+            distinct = text_values.get(col)
+            low_cardinality = distinct is not None and len(distinct) <= DICTIONARY_MAX_RATIO * text_counts[col]
+            arrow_types[col] = pa.dictionary(pa.int32(), pa.string()) if low_cardinality else pa.string()
+        elif integral[col]:
+            kinds[col] = "int"
+            arrow_types[col] = pa.from_numpy_dtype(smallest_int_type(*bounds[col]))
+        else:
+            kinds[col] = "float"
+            # Filled medians must survive the narrowing too
+            exact = float32_exact[col] and float32_is_exact([sketches[col].median()])
+            arrow_types[col] = pa.float32() if exact else pa.float64()
+    medians = {col: sketches[col].median() for col in kept if kinds[col] != "text"}
+    schema = pa.schema([(col, arrow_types[col]) for col in kept])
+    return kept, kinds, medians, schema
+
+
+def stream_transform(full_path, output_path, fill_median_axis='column', chunksize=100_000,
+                     sample_rows=10_000, sketch_size=8192, row_group_size=ROW_GROUP_SIZE, partition_cols=None,
+                     contract=None):
+    if fill_median_axis not in ('column', 'row'):
+        raise ValueError("fill_median_axis must be either 'row' or 'column'")
+
+    column_kinds = contract.families if contract is not None else None
+    kept, kinds, medians, schema = profile_columns(full_path, chunksize, sample_rows, sketch_size, column_kinds)
+    if contract is not None:
+        schema = contract.conform_schema(schema)
+    numeric_cols = [col for col in kept if kinds[col] != "text"]
+
+    def cleaned_tables():
+        for chunk in iter_chunks(full_path, chunksize):
+            chunk = clean_chunk_text(chunk[kept])
+            for col in numeric_cols:
+                values = pd.to_numeric(chunk[col])
+                # "int" columns never contain nulls, so only float columns need filling
+                chunk[col] = values if kinds[col] == "int" else values.astype(np.float64)
+            if fill_median_axis == 'column':
+                chunk = chunk.fillna({col: medians[col] for col in numeric_cols if kinds[col] == "float"})
+            else:
+                chunk = fill_row_medians(chunk)
+            chunk = sort_by_natural_keys(chunk)
+            yield pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+    rows = 0
+    partition_cols = [col for col in partition_cols or [] if col in kept]
+    if partition_cols:
+        for n, table in enumerate(cleaned_tables()):
+            write_partitions(table, os.path.dirname(output_path), partition_cols, basename=f"part-{n}-{{i}}.parquet",
+                             row_group_size=row_group_size)
+            rows += table.num_rows
+        return rows
+
+    tmp_path = output_path + ".tmp"
+    with pq.ParquetWriter(tmp_path, schema, compression=COMPRESSION, write_statistics=True) as writer:
+        for table in cleaned_tables():
+            writer.write_table(table, row_group_size=row_group_size)
+            rows += table.num_rows
+    os.replace(tmp_path, output_path)
+    return rows
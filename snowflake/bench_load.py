@@ -0,0 +1,87 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pyarrow.parquet as pq
+
+from upload_data import bulk_upload_to_snowflake, map_dtype_arrow_to_snowflake, prepare_upload_files
+from warehouse import DuckDBWarehouse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config.schema_registry import arrow_family, get_registry, sanitize_table_name, type_family
+from dashboards.silver_reader import list_silver_datasets, open_silver
+
+# Runs the bulk load path end to end against the DuckDB stand-in, no Snowflake account needed:
+#   1. full load of every silver dataset, with per-table timings
+#   2. a rerun, where the load ledger should skip every table
+#   3. checks: warehouse row counts match silver, and every column's warehouse type is in
+#      the family map_dtype_arrow_to_snowflake (or the registry contract) gives its Arrow type
+#   python snowflake/bench_load.py --base-folder data/silver
+
+
+def check_table(warehouse, base_folder, folder):
+    table_name = sanitize_table_name(folder)
+    problems = []
+    dataset = open_silver(os.path.join(base_folder, folder))
+    expected_rows = dataset.count_rows()
+    rows = warehouse.con.execute(f'SELECT count(*) FROM "{table_name}"').fetchone()[0]
+    if rows != expected_rows:
+        problems.append(f"{rows} rows loaded, silver has {expected_rows}")
+
+    loaded_types = warehouse.column_types(table_name)
+    contract = get_registry().get(table_name)
+    declared = dict(contract.columns) if contract is not None else {}
+    for field in dataset.schema:
+        if field.name not in loaded_types:
+            problems.append(f"column {field.name!r} missing")
+            continue
+        mapped = declared.get(field.name, map_dtype_arrow_to_snowflake(field.type))
+        loaded = type_family(loaded_types[field.name])
+        if type_family(mapped) != loaded:
+            problems.append(f"{field.name}: {field.type} -> {mapped}, loaded as {loaded_types[field.name]}")
+        elif arrow_family(field.type) != loaded and not (arrow_family(field.type) == "int" and loaded == "float"):
+            problems.append(f"{field.name}: Arrow {field.type} does not fit {loaded_types[field.name]}")
+    return table_name, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and check the load path against a local DuckDB warehouse")
+    parser.add_argument("--base-folder", default="data/silver", help="Silver directory")
+    parser.add_argument("--chunk-mb", type=float, default=64, help="Split silver files larger than this")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        warehouse = DuckDBWarehouse(os.path.join(tmp, "bench.duckdb"))
+        try:
+            print("🧪 Full load")
+            started = time.perf_counter()
+            first = bulk_upload_to_snowflake(warehouse, args.base_folder, chunk_mb=args.chunk_mb)
+            full_seconds = time.perf_counter() - started
+
+            print("\n🧪 Rerun (nothing changed)")
+            started = time.perf_counter()
+            second = bulk_upload_to_snowflake(warehouse, args.base_folder, chunk_mb=args.chunk_mb)
+            rerun_seconds = time.perf_counter() - started
+
+            failures = 0
+            print("\n🔎 Checks")
+            for folder in list_silver_datasets(args.base_folder):
+                table_name, problems = check_table(warehouse, args.base_folder, folder)
+                for problem in problems:
+                    print(f"❌ {table_name}: {problem}")
+                failures += len(problems)
+            if second:
+                failures += 1
+                print(f"❌ Rerun reloaded {len(second)} table(s) instead of skipping them")
+        finally:
+            warehouse.close()
+
+    print(f"\n⏱️ Full load {full_seconds:.2f}s for {len(first)} table(s), rerun {rerun_seconds:.2f}s")
+    print("✅ Row counts and column types match" if not failures else f"❌ {failures} problem(s)")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,31 @@
 import os
+import glob
 import hashlib
-import snowflake.connector
 import sys
-from dotenv import load_dotenv
+import time
+import shutil
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import pyarrow as pa
 import pyarrow.parquet as pq
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from config.snowflake_config import *
-load_dotenv()
-
-conn = snowflake.connector.connect(
-    user=SNOWFLAKE_USER,
-    password=SNOWFLAKE_PASSWORD,
-    account=SNOWFLAKE_ACCOUNT,
-    warehouse=SNOWFLAKE_WAREHOUSE,
-    database=SNOWFLAKE_DATABASE,
-    schema=SNOWFLAKE_SCHEMA,
-    role=SNOWFLAKE_ROLE
-)
-cursor = conn.cursor()
-
-def sanitize_table_name(name):
-    name = name.lower().replace(" ", "_").replace("-", "_").replace(",", "_")
-    short_hash = hashlib.md5(name.encode()).hexdigest()[:8]
-    return f"{name[:72]}_{short_hash}"
+from config.schema_registry import get_registry, sanitize_table_name
+from dashboards.silver_reader import list_silver_datasets, open_silver
+from warehouse import BACKENDS, PUT_PARALLEL, open_warehouse
+
+# Bulk mode: silver files bigger than this (and partitioned datasets) are rewritten into
+# chunks of about this size so PUT can upload them in parallel
+CHUNK_MB = 64
+
+# Where --backend duckdb keeps its local warehouse
+DUCKDB_PATH = "data/warehouse.duckdb"
 
 def map_dtype_arrow_to_snowflake(pa_type):
+    # Silver stores low-cardinality text dictionary-encoded; map the values, not the indices
+    if pa.types.is_dictionary(pa_type):
+        pa_type = pa_type.value_type
     pa_type = str(pa_type).lower()
     if "int" in pa_type:
         return "NUMBER"
@@ -40,66 +40,180 @@ def map_dtype_arrow_to_snowflake(pa_type):
     else:
         return "STRING"
 
-def create_table_from_parquet(cursor, table_name, parquet_file_path):
-    table_name_clean = table_name.lower()
+def table_columns(table_name, parquet_file_path):
+    # (name, Snowflake type) pairs for the table's DDL
     parquet_schema = pq.read_schema(parquet_file_path)
-
-    column_defs = ",\n    ".join([
-        f'"{field.name}" {map_dtype_arrow_to_snowflake(field.type)}'
-        for field in parquet_schema
-    ])
-
-    create_stmt = f"""
-    CREATE TABLE IF NOT EXISTS "{table_name_clean}" (
-        {column_defs}
-    );
-    """
+    contract = get_registry().get(table_name)
+    if contract is not None:
+        # DDL comes from the registry; a file that no longer fits it raises SchemaDriftError before any load
+        contract.conform_schema(parquet_schema)
+        return contract.columns
+    return [(field.name, map_dtype_arrow_to_snowflake(field.type)) for field in parquet_schema]
+
+def create_table_from_parquet(warehouse, table_name, parquet_file_path):
+    table_name_clean = table_name.lower()
     print(f"🛠️ Creating table if not exists: {table_name_clean}")
-    cursor.execute(create_stmt)
-
-def upload_parquet_to_snowflake(base_folder="data/silver"):
+    warehouse.create_table(table_name_clean, table_columns(table_name_clean, parquet_file_path))
+
+def upload_parquet_to_snowflake(warehouse, base_folder="data/silver"):
+    for original_table_name in list_silver_datasets(base_folder):
+        table_path = os.path.join(base_folder, original_table_name)
+
+        sanitized_table = sanitize_table_name(original_table_name)
+        parquet_files = [f for f in os.listdir(table_path) if f.endswith('.parquet')]
+        if not parquet_files:
+            print(f"❌ No parquet files in {table_path}, skipping.")
+            continue
+
+        for file in parquet_files:
+            local_file_path = os.path.abspath(os.path.join(table_path, file))
+
+            # Create table based on parquet schema
+            create_table_from_parquet(warehouse, sanitized_table, local_file_path)
+
+            # Stage and load this one file
+            rows, _, _ = warehouse.bulk_load({sanitized_table: [local_file_path]})[sanitized_table]
+
+            print(f"✅ Loaded '{file}' ({rows} rows) into {warehouse.name} table '{sanitized_table}'")
+
+
+def prepare_upload_files(table_path, work_dir, chunk_mb=CHUNK_MB):
+    # A single small file is uploaded as is. Large files are split by rows into chunks, and
+    # partitioned datasets are rewritten too, since their partition columns only exist in
+    # the directory names. Returns the files to PUT.
+    files = [os.path.join(table_path, f) for f in os.listdir(table_path) if f.endswith('.parquet')]
+    has_partitions = any(os.path.isdir(os.path.join(table_path, f)) for f in os.listdir(table_path))
+    chunk_bytes = chunk_mb * 1024 * 1024
+    if len(files) == 1 and not has_partitions and os.path.getsize(files[0]) <= chunk_bytes:
+        return [os.path.abspath(files[0])]
+
+    dataset = open_silver(table_path)
+    total_bytes = sum(os.path.getsize(f) for f in dataset.files)
+    total_rows = dataset.count_rows()
+    rows_per_chunk = max(1, int(total_rows * chunk_bytes / max(total_bytes, 1)))
+
+    os.makedirs(work_dir, exist_ok=True)
+    chunk_files = []
+    writer = None
+    rows_in_chunk = 0
+    for batch in dataset.to_batches(batch_size=rows_per_chunk):
+        if writer is None or rows_in_chunk >= rows_per_chunk:
+            if writer is not None:
+                writer.close()
+            chunk_files.append(os.path.join(work_dir, f"part-{len(chunk_files):05d}.parquet"))
+            writer = pq.ParquetWriter(chunk_files[-1], batch.schema, compression="zstd")
+            rows_in_chunk = 0
+        writer.write_batch(batch)
+        rows_in_chunk += batch.num_rows
+    if writer is not None:
+        writer.close()
+    return chunk_files
+
+
+def dataset_hash(table_path):
+    # Content hash over every silver file of a dataset; any rebuild that changes data changes it
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(table_path, "**", "*.parquet"), recursive=True)):
+        digest.update(os.path.relpath(path, table_path).encode() + b"\0")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def print_load_summary(timings, skipped, total_seconds):
+    print("\n📊 Load summary")
+    for table_name in sorted(skipped):
+        print(f"⏭️ {table_name}: unchanged since last load")
+    for table_name, t in sorted(timings.items()):
+        print(f"✅ {table_name}: {t['rows']} rows from {t['files']} file(s) via {t['method']}, "
+              f"upload {t['put_seconds']:.2f}s, load {t['copy_seconds']:.2f}s, apply {t['apply_seconds']:.2f}s")
+    print(f"⏱️ Total wall time: {total_seconds:.2f}s")
+
+
+def bulk_upload_to_snowflake(warehouse, base_folder="data/silver", parallel=PUT_PARALLEL, chunk_mb=CHUNK_MB,
+                             workers=4, full_reload=False):
+    # Every changed dataset is bulk-loaded into a staging table (on Snowflake: one stage,
+    # parallel PUT, one async COPY per table), merged into the target on its natural keys
+    # and recorded in the load ledger, so datasets whose content hash is unchanged since
+    # their last load are skipped on the next run.
+    started = time.perf_counter()
+    work_dir = tempfile.mkdtemp(prefix="silver_upload_")
+    timings = {}
+    skipped = []
     try:
-        for original_table_name in os.listdir(base_folder):
-            table_path = os.path.join(base_folder, original_table_name)
-            if not os.path.isdir(table_path):
+        ledger = {} if full_reload else warehouse.load_ledger()
+
+        tables = {}
+        hashes = {}
+        for folder in list_silver_datasets(base_folder):
+            table_name = sanitize_table_name(folder)
+            table_path = os.path.join(base_folder, folder)
+            hashes[table_name] = dataset_hash(table_path)
+            if ledger.get(table_name) == hashes[table_name]:
+                skipped.append(table_name)
                 continue
-
-            sanitized_table = sanitize_table_name(original_table_name)
-            parquet_files = [f for f in os.listdir(table_path) if f.endswith('.parquet')]
-            if not parquet_files:
-                print(f"❌ No parquet files in {table_path}, skipping.")
+            files = prepare_upload_files(table_path, os.path.join(work_dir, table_name), chunk_mb)
+            if not files:
+                print(f"❌ No parquet files in {folder}, skipping.")
                 continue
-
-            for file in parquet_files:
-                local_file_path = os.path.abspath(os.path.join(table_path, file))
-
-                # Create table based on parquet schema
-                create_table_from_parquet(cursor, sanitized_table, local_file_path)
-
-                # Create a temporary stage
-                stage_name = f"staging_{sanitized_table}"
-                cursor.execute(f"CREATE OR REPLACE TEMPORARY STAGE {stage_name}")
-                stage_path = f"@{stage_name}"
-
-                # PUT command to upload parquet to stage
-                put_command = f"PUT 'file://{local_file_path}' {stage_path} AUTO_COMPRESS=TRUE"
-                print(f"🔼 PUT: {put_command}")
-                cursor.execute(put_command)
-
-                # COPY INTO command
-                copy_command = f"""
-                    COPY INTO "{sanitized_table}"
-                    FROM {stage_path}
-                    FILE_FORMAT = (TYPE = PARQUET)
-                    MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
-                    PURGE = TRUE
-                """
-                print(f"📥 COPY INTO: {copy_command.strip()}")
-                cursor.execute(copy_command)
-
-                print(f"✅ Loaded '{file}' into Snowflake table '{sanitized_table}'")
+            create_table_from_parquet(warehouse, table_name, files[0])
+            tables[table_name] = (warehouse.create_staging_table(table_name), files)
+
+        loaded = warehouse.bulk_load({staging: files for staging, files in tables.values()}, parallel, workers)
+
+        merges = {}
+        for table_name, (staging, files) in tables.items():
+            contract = get_registry().get(table_name)
+            natural_keys = contract.natural_keys if contract is not None else []
+            merges[table_name] = (staging, pq.read_schema(files[0]).names, natural_keys)
+            rows, put_seconds, copy_seconds = loaded[staging]
+            timings[table_name] = {"rows": rows, "files": len(files), "method": "merge" if natural_keys else "replace",
+                                   "put_seconds": put_seconds, "copy_seconds": copy_seconds}
+
+        def apply(item):
+            table_name, (staging, columns, natural_keys) = item
+            apply_started = time.perf_counter()
+            warehouse.merge(table_name, staging, columns, natural_keys)
+            return time.perf_counter() - apply_started
+
+        with ThreadPoolExecutor(max_workers=workers if warehouse.concurrent_merges else 1) as pool:
+            apply_seconds = dict(zip(merges, pool.map(apply, merges.items())))
+
+        for table_name in tables:
+            timings[table_name]["apply_seconds"] = apply_seconds[table_name]
+            warehouse.record_load(table_name, hashes[table_name], timings[table_name]["rows"])
     finally:
-        cursor.close()
-        conn.close()
-
-upload_parquet_to_snowflake()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_load_summary(timings, skipped, time.perf_counter() - started)
+    return timings
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load silver Parquet datasets into a warehouse")
+    parser.add_argument("--base-folder", default="data/silver", help="Silver directory")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="snowflake",
+                        help="snowflake, or duckdb for a local embedded stand-in")
+    parser.add_argument("--duckdb-path", default=DUCKDB_PATH, help="Database file for --backend duckdb")
+    parser.add_argument("--mode", choices=["bulk", "per-file"], default="bulk",
+                        help="bulk: incremental load with one stage, parallel PUT and one async COPY per table; "
+                             "per-file: the original loop")
+    parser.add_argument("--parallel", type=int, default=PUT_PARALLEL, help="PUT upload threads per table")
+    parser.add_argument("--chunk-mb", type=float, default=CHUNK_MB, help="Split silver files larger than this")
+    parser.add_argument("--workers", type=int, default=4, help="Tables staged concurrently")
+    parser.add_argument("--full-reload", action="store_true", help="Ignore the load ledger and reload every table")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    warehouse = open_warehouse(args.backend, **({"path": args.duckdb_path} if args.backend == "duckdb" else {}))
+    try:
+        if args.mode == "bulk":
+            bulk_upload_to_snowflake(warehouse, args.base_folder, args.parallel, args.chunk_mb, args.workers,
+                                     args.full_reload)
+        else:
+            upload_parquet_to_snowflake(warehouse, args.base_folder)
+    finally:
+        warehouse.close()
@@ -0,0 +1,271 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config.schema_registry import type_family
+
+# The load path in upload_data.py talks to a Warehouse instead of a Snowflake cursor:
+#   create_table(table, columns)     columns are (name, Snowflake type) pairs
+#   create_staging_table(table)      empty session-scoped copy of `table`, returns its name
+#   bulk_load({target: files})       loads Parquet files, returns {target: (rows, upload s, load s)}
+#   merge(table, staging, columns, natural_keys)
+#   load_ledger() / record_load(table, hash, rows)
+# SnowflakeWarehouse is the real thing; DuckDBWarehouse runs the same Parquet inputs
+# through an embedded database so loads can be tested and benchmarked offline.
+
+LEDGER_TABLE = "_load_ledger"
+STAGING_SUFFIX = "__staging"
+BULK_STAGE = "silver_bulk_load"
+PUT_PARALLEL = 8
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class Warehouse:
+    name = "warehouse"
+    # Whether merge() may be called from several threads at once
+    concurrent_merges = False
+
+    def create_table(self, table_name, columns):
+        raise NotImplementedError
+
+    def create_staging_table(self, table_name):
+        raise NotImplementedError
+
+    def bulk_load(self, loads, parallel=PUT_PARALLEL, workers=4):
+        raise NotImplementedError
+
+    def merge(self, table_name, staging_table, columns, natural_keys):
+        raise NotImplementedError
+
+    def load_ledger(self):
+        raise NotImplementedError
+
+    def record_load(self, table_name, file_hash, rows):
+        raise NotImplementedError
+
+    def column_types(self, table_name):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def merge_statements(self, table_name, staging_table, columns, natural_keys):
+        # With natural keys: drop rows whose key is gone, update matched rows, insert new
+        # ones. Without: replace the table's contents. Run inside one transaction, in this
+        # order on every backend. Keys are compared null-safely, so a row with a NULL key
+        # part still matches itself instead of being pruned.
+        table, staging = quote(table_name), quote(staging_table)
+        if not natural_keys:
+            return [f"DELETE FROM {table}", f"INSERT INTO {table} SELECT * FROM {staging}"]
+        on = " AND ".join(f"t.{quote(key)} IS NOT DISTINCT FROM s.{quote(key)}" for key in natural_keys)
+        updates = ", ".join(f"{quote(col)} = s.{quote(col)}" for col in columns if col not in natural_keys)
+        insert_cols = ", ".join(quote(col) for col in columns)
+        statements = [f"DELETE FROM {table} t WHERE NOT EXISTS (SELECT 1 FROM {staging} s WHERE {on})"]
+        if updates:
+            statements.append(f"UPDATE {table} t SET {updates} FROM {staging} s WHERE {on}")
+        statements.append(f"INSERT INTO {table} ({insert_cols}) SELECT {insert_cols} FROM {staging} s "
+                          f"WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE {on})")
+        return statements
+
+
+class SnowflakeWarehouse(Warehouse):
+    name = "snowflake"
+    # Transactions belong to the session, not the cursor: concurrent BEGIN/COMMITs on one
+    # connection would commit or roll back each other's merges. The staging tables are
+    # session-scoped temporary tables, so the merges cannot move to other connections.
+    concurrent_merges = False
+
+    def __init__(self, conn=None):
+        if conn is None:
+            from config.snowflake_config import connect
+            conn = connect()
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.stage_ready = False
+
+    def create_table(self, table_name, columns):
+        column_defs = ",\n    ".join(f"{quote(name)} {sf_type}" for name, sf_type in columns)
+        self.cursor.execute(f"CREATE TABLE IF NOT EXISTS {quote(table_name)} (\n    {column_defs}\n)")
+
+    def create_staging_table(self, table_name):
+        staging_table = table_name + STAGING_SUFFIX
+        self.cursor.execute(f"CREATE OR REPLACE TEMPORARY TABLE {quote(staging_table)} LIKE {quote(table_name)}")
+        return staging_table
+
+    def put_files(self, target, files, parallel):
+        # One PUT per table: a glob when the files were chunked into a work directory
+        started = time.perf_counter()
+        put_cursor = self.conn.cursor()
+        try:
+            source = files[0] if len(files) == 1 else os.path.join(os.path.dirname(files[0]), "*.parquet")
+            put_cursor.execute(f"PUT 'file://{source}' @{BULK_STAGE}/{target}/ PARALLEL={parallel} AUTO_COMPRESS=FALSE")
+        finally:
+            put_cursor.close()
+        return time.perf_counter() - started
+
+    def wait_for_queries(self, queries, poll_seconds=0.5):
+        # queries: {target: (query id, submitted at)} -> {target: (rows loaded, seconds)}
+        results = {}
+        pending = dict(queries)
+        while pending:
+            for target, (query_id, submitted) in list(pending.items()):
+                status = self.conn.get_query_status_throw_if_error(query_id)
+                if self.conn.is_still_running(status):
+                    continue
+                finished = time.perf_counter()
+                result_cursor = self.conn.cursor()
+                result_cursor.get_results_from_sfqid(query_id)
+                columns = [col[0].lower() for col in result_cursor.description]
+                rows = result_cursor.fetchall()
+                result_cursor.close()
+                loaded = sum(row[columns.index("rows_loaded")] for row in rows) if "rows_loaded" in columns else 0
+                results[target] = (loaded, finished - submitted)
+                del pending[target]
+            if pending:
+                time.sleep(poll_seconds)
+        return results
+
+    def bulk_load(self, loads, parallel=PUT_PARALLEL, workers=4):
+        # One stage per run, one parallel PUT per target into its own stage prefix, then one
+        # COPY per target, all submitted asynchronously so targets load concurrently
+        if not self.stage_ready:
+            self.cursor.execute(f"CREATE OR REPLACE TEMPORARY STAGE {BULK_STAGE} FILE_FORMAT = (TYPE = PARQUET)")
+            self.stage_ready = True
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            put_seconds = dict(zip(loads, pool.map(lambda item: self.put_files(*item, parallel), loads.items())))
+        print(f"🔼 Staged {sum(len(f) for f in loads.values())} file(s) for {len(loads)} table(s)")
+
+        queries = {}
+        for target in loads:
+            self.cursor.execute_async(f"""
+                COPY INTO {quote(target)}
+                FROM @{BULK_STAGE}/{target}/
+                FILE_FORMAT = (TYPE = PARQUET)
+                MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+                PURGE = TRUE
+            """)
+            queries[target] = (self.cursor.sfqid, time.perf_counter())
+        print(f"📥 Submitted {len(queries)} COPY INTO statement(s)")
+        copies = self.wait_for_queries(queries)
+        return {target: (copies[target][0], put_seconds[target], copies[target][1]) for target in loads}
+
+    def merge(self, table_name, staging_table, columns, natural_keys):
+        merge_cursor = self.conn.cursor()
+        try:
+            merge_cursor.execute("BEGIN")
+            for statement in self.merge_statements(table_name, staging_table, columns, natural_keys):
+                merge_cursor.execute(statement)
+            merge_cursor.execute("COMMIT")
+        except Exception:
+            merge_cursor.execute("ROLLBACK")
+            raise
+        finally:
+            merge_cursor.close()
+
+    def load_ledger(self):
+        self.cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {quote(LEDGER_TABLE)} (
+                "table_name" VARCHAR, "file_hash" VARCHAR, "rows_loaded" NUMBER, "loaded_at" TIMESTAMP_NTZ
+            )
+        """)
+        self.cursor.execute(f'SELECT "table_name", "file_hash" FROM {quote(LEDGER_TABLE)}')
+        return dict(self.cursor.fetchall())
+
+    def record_load(self, table_name, file_hash, rows):
+        self.cursor.execute(f"""
+            MERGE INTO {quote(LEDGER_TABLE)} l
+            USING (SELECT %s AS "table_name", %s AS "file_hash", %s AS "rows_loaded") s
+            ON l."table_name" = s."table_name"
+            WHEN MATCHED THEN UPDATE SET "file_hash" = s."file_hash", "rows_loaded" = s."rows_loaded",
+                "loaded_at" = CURRENT_TIMESTAMP()
+            WHEN NOT MATCHED THEN INSERT ("table_name", "file_hash", "rows_loaded", "loaded_at")
+                VALUES (s."table_name", s."file_hash", s."rows_loaded", CURRENT_TIMESTAMP())
+        """, (table_name, file_hash, rows))
+
+    def column_types(self, table_name):
+        self.cursor.execute(f"DESCRIBE TABLE {quote(table_name)}")
+        return {row[0]: row[1] for row in self.cursor.fetchall()}
+
+    def close(self):
+        self.cursor.close()
+        self.conn.close()
+
+
+# Snowflake type family -> DuckDB type
+DUCKDB_TYPES = {"int": "BIGINT", "float": "DOUBLE", "bool": "BOOLEAN", "timestamp": "TIMESTAMP", "text": "VARCHAR"}
+
+
+class DuckDBWarehouse(Warehouse):
+    name = "duckdb"
+
+    def __init__(self, path=":memory:"):
+        import duckdb
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.con = duckdb.connect(path)
+
+    def create_table(self, table_name, columns):
+        column_defs = ", ".join(f"{quote(name)} {DUCKDB_TYPES[type_family(sf_type)]}" for name, sf_type in columns)
+        self.con.execute(f"CREATE TABLE IF NOT EXISTS {quote(table_name)} ({column_defs})")
+
+    def create_staging_table(self, table_name):
+        staging_table = table_name + STAGING_SUFFIX
+        self.con.execute(f"CREATE OR REPLACE TEMPORARY TABLE {quote(staging_table)} AS "
+                         f"SELECT * FROM {quote(table_name)} LIMIT 0")
+        return staging_table
+
+    def bulk_load(self, loads, parallel=PUT_PARALLEL, workers=4):
+        # No upload step: each target is one INSERT over all of its files, matched by name
+        results = {}
+        for target, files in loads.items():
+            started = time.perf_counter()
+            columns = [row[0] for row in self.con.execute(f"DESCRIBE {quote(target)}").fetchall()]
+            select = ", ".join(quote(col) for col in columns)
+            rows = self.con.execute(
+                f"INSERT INTO {quote(target)} ({select}) SELECT {select} FROM read_parquet(?, union_by_name = true)",
+                [files],
+            ).fetchone()[0]
+            results[target] = (rows, 0.0, time.perf_counter() - started)
+        return results
+
+    def merge(self, table_name, staging_table, columns, natural_keys):
+        statements = self.merge_statements(table_name, staging_table, columns, natural_keys)
+        self.con.execute("BEGIN TRANSACTION")
+        try:
+            for statement in statements:
+                self.con.execute(statement)
+            self.con.execute("COMMIT")
+        except Exception:
+            self.con.execute("ROLLBACK")
+            raise
+
+    def load_ledger(self):
+        self.con.execute(f"""
+            CREATE TABLE IF NOT EXISTS {quote(LEDGER_TABLE)} (
+                "table_name" VARCHAR PRIMARY KEY, "file_hash" VARCHAR, "rows_loaded" BIGINT, "loaded_at" TIMESTAMP
+            )
+        """)
+        return dict(self.con.execute(f'SELECT "table_name", "file_hash" FROM {quote(LEDGER_TABLE)}').fetchall())
+
+    def record_load(self, table_name, file_hash, rows):
+        self.con.execute(f"INSERT OR REPLACE INTO {quote(LEDGER_TABLE)} VALUES (?, ?, ?, current_timestamp)",
+                         [table_name, file_hash, rows])
+
+    def column_types(self, table_name):
+        return {row[0]: row[1] for row in self.con.execute(f"DESCRIBE {quote(table_name)}").fetchall()}
+
+    def close(self):
+        self.con.close()
+
+
+BACKENDS = {"snowflake": SnowflakeWarehouse, "duckdb": DuckDBWarehouse}
+
+
+def open_warehouse(backend="snowflake", **kwargs):
+    return BACKENDS[backend](**kwargs)
@@ -0,0 +1,34 @@
+import glob
+import os
+import sys
+import warnings
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts', 'transformation')))
+from bench_clean import legacy_transform_dataframe, make_synthetic
+from cleaning import transform_dataframe
+
+BRONZE_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'bronze')
+BRONZE_CSVS = sorted(glob.glob(os.path.join(BRONZE_DIR, "**", "*.csv"), recursive=True))
+
+
+def legacy(df, axis):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        return legacy_transform_dataframe(df.copy(), fill_median_axis=axis)
+
+
+@pytest.mark.parametrize("axis", ["column", "row"])
+def test_synthetic_matches_legacy(axis):
+    df = make_synthetic(5_000)
+    pd.testing.assert_frame_equal(transform_dataframe(df.copy(), fill_median_axis=axis), legacy(df, axis),
+                                  check_exact=False, rtol=1e-12)
+
+
+@pytest.mark.parametrize("axis", ["column", "row"])
+@pytest.mark.parametrize("path", BRONZE_CSVS, ids=[os.path.basename(path) for path in BRONZE_CSVS])
+def test_bronze_matches_legacy(path, axis):
+    df = pd.read_csv(path)
+    pd.testing.assert_frame_equal(transform_dataframe(df.copy(), fill_median_axis=axis), legacy(df, axis))
@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from dashboards.silver_reader import SILVER_DIR, list_dataset_names
+from dashboards.sql_engine import connection, run_query
+
+pytestmark = pytest.mark.skipif(not os.path.isdir(SILVER_DIR) or not list_dataset_names(SILVER_DIR),
+                                reason="no silver datasets built")
+
+
+def test_silver_views_are_queryable():
+    name = list_dataset_names(SILVER_DIR)[0]
+    df, _ = run_query(f'SELECT COUNT(*) AS n FROM "{name}"')
+    assert df["n"].iloc[0] > 0
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT * FROM read_text('/etc/passwd')",
+    "SELECT * FROM read_csv('requirements.txt')",
+    f"SELECT * FROM read_text('{os.path.abspath(SILVER_DIR)}/../../README.md')",
+])
+def test_files_outside_silver_are_rejected(sql):
+    with pytest.raises(Exception, match="disabled by configuration"):
+        run_query(sql)
+
+
+def test_configuration_cannot_be_unlocked():
+    cursor = connection().cursor()
+    try:
+        with pytest.raises(Exception, match="locked"):
+            cursor.execute("SET enable_external_access = true")
+    finally:
+        cursor.close()
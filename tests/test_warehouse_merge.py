@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'snowflake')))
+from warehouse import DuckDBWarehouse, SnowflakeWarehouse, quote
+
+COLUMNS = [("state", "STRING"), ("year", "STRING"), ("festival", "STRING"), ("visitors", "NUMBER")]
+KEYS = ["state", "year", "festival"]
+ROWS = [
+    ("Kerala", "2015-16", "Onam", 10),
+    ("Kerala", "2016-17", None, 20),
+    ("Manipur", "2017-18", None, 30),
+    ("Nagaland", "2017-18", "Hornbill", 40),
+]
+
+
+def load(warehouse, rows):
+    staging = warehouse.create_staging_table("fairs")
+    warehouse.con.executemany(f"INSERT INTO {quote(staging)} VALUES (?, ?, ?, ?)", rows)
+    warehouse.merge("fairs", staging, [name for name, _ in COLUMNS], KEYS)
+    return sorted(warehouse.con.execute("SELECT * FROM fairs").fetchall(), key=repr)
+
+
+@pytest.fixture
+def warehouse():
+    warehouse = DuckDBWarehouse()
+    warehouse.create_table("fairs", COLUMNS)
+    yield warehouse
+    warehouse.close()
+
+
+def test_reload_keeps_rows_with_null_keys(warehouse):
+    assert load(warehouse, ROWS) == sorted(ROWS, key=repr)
+    assert load(warehouse, ROWS) == sorted(ROWS, key=repr)
+
+
+def test_merge_updates_inserts_and_prunes_null_keyed_rows(warehouse):
+    load(warehouse, ROWS)
+    changed = [
+        ("Kerala", "2015-16", "Onam", 11),
+        ("Kerala", "2016-17", None, 21),
+        ("Puducherry", "2018-19", None, 50),
+    ]
+    assert load(warehouse, changed) == sorted(changed, key=repr)
+
+
+def test_backends_share_statement_order():
+    args = ("fairs", "fairs__staging", [name for name, _ in COLUMNS], KEYS)
+    statements = DuckDBWarehouse.merge_statements(None, *args)
+    assert statements == SnowflakeWarehouse.merge_statements(None, *args)
+    assert [statement.split()[0] for statement in statements] == ["DELETE", "UPDATE", "INSERT"]
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'snowflake')))
+from config.gold_specs import GOLD_SPECS, aggregates
+from dashboards import gold
+from dashboards.silver_reader import SILVER_DIR, list_dataset_names
+from dashboards.warehouse_source import WarehouseSource
+from upload_data import bulk_upload_to_snowflake
+from warehouse import DuckDBWarehouse
+
+pytestmark = pytest.mark.skipif(not os.path.isdir(SILVER_DIR) or not list_dataset_names(SILVER_DIR),
+                                reason="no silver datasets built")
+
+CASES = [(dataset, keys, cumulative) for dataset in GOLD_SPECS
+         for keys, cumulative in aggregates(dataset).values()]
+
+
+@pytest.fixture(scope="module")
+def source(tmp_path_factory):
+    # Local stand-in warehouse loaded from the current silver, like upload_data.py --backend duckdb
+    path = str(tmp_path_factory.mktemp("warehouse") / "warehouse.duckdb")
+    warehouse = DuckDBWarehouse(path)
+    bulk_upload_to_snowflake(warehouse, SILVER_DIR)
+    warehouse.close()
+    return WarehouseSource("duckdb", path=path)
+
+
+def assert_same_totals(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert_same_totals(actual[key], value)
+            continue
+        assert type(actual[key]) is type(value), key
+        if isinstance(value, float):
+            assert actual[key] == pytest.approx(value, nan_ok=True), key
+        else:
+            assert actual[key] == value, key
+
+
+@pytest.mark.parametrize("dataset, keys, cumulative", CASES)
+def test_totals_match_gold(source, dataset, keys, cumulative):
+    if cumulative:
+        assert_same_totals(source.year_totals(dataset), gold.year_totals(dataset))
+    else:
+        assert_same_totals(source.group_totals(dataset, keys), gold.group_totals(dataset, keys))